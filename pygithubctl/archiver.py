@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import gzip
+import io
+import stat
+import tarfile
+import zipfile
+
+# Timestamp of every archive entry; the earliest one the zip format can hold,
+# so that archives of the same commit are byte for byte reproducible.
+MTIME = 315532800
+
+# Supported values of --output-format.
+FORMATS = ('tar', 'tar.gz', 'zip')
+
+
+class TarArchive(object):
+    """
+    Writes the entries to a tar archive in streaming mode, so the output can
+    be a pipe or stdout. The gzip header carries no timestamp or filename.
+    """
+
+    def __init__(self, stream, compress=False):
+        self.gzip = gzip.GzipFile(filename='', fileobj=stream, mode='wb', mtime=0) if compress else None
+        self.tar = tarfile.open(fileobj=self.gzip or stream, mode='w|', format=tarfile.PAX_FORMAT)
+        self.directories = set()
+
+    def add_directory(self, path):
+        if not path or path in self.directories:
+            return
+        self.add_directory(path.rpartition('/')[0])
+        self.directories.add(path)
+        self.tar.addfile(self.get_info(path, tarfile.DIRTYPE, 0o755))
+
+    def add(self, path, data, mode=0o644):
+        self.add_directory(path.rpartition('/')[0])
+        info = self.get_info(path, tarfile.REGTYPE, mode)
+        info.size = len(data)
+        self.tar.addfile(info, io.BytesIO(data))
+
+    def add_link(self, path, target):
+        self.add_directory(path.rpartition('/')[0])
+        info = self.get_info(path, tarfile.SYMTYPE, 0o777)
+        info.linkname = target
+        self.tar.addfile(info)
+
+    def get_info(self, path, type, mode):
+        info = tarfile.TarInfo(path)
+        info.type = type
+        info.mode = mode
+        info.mtime = MTIME
+        info.uid = info.gid = 0
+        info.uname = info.gname = ''
+        return info
+
+    def close(self):
+        self.tar.close()
+        if self.gzip:
+            self.gzip.close()
+
+
+class ZipArchive(object):
+    """
+    Writes the entries to a zip archive. The zipfile module falls back to data
+    descriptors when the output is not seekable, so stdout works as well.
+    """
+
+    def __init__(self, stream):
+        self.zip = zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED)
+
+    def add(self, path, data, mode=0o644):
+        info = zipfile.ZipInfo(path, date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = (stat.S_IFREG | mode) << 16
+        self.zip.writestr(info, data)
+
+    def add_link(self, path, target):
+        # Symbolic links are stored with their target as content and the
+        # link file type in the Unix attributes, the way Info-ZIP does.
+        info = zipfile.ZipInfo(path, date_time=(1980, 1, 1, 0, 0, 0))
+        info.external_attr = (stat.S_IFLNK | 0o777) << 16
+        self.zip.writestr(info, target)
+
+    def close(self):
+        self.zip.close()
+
+
+def open_archive(stream, output_format):
+    """
+    Opens an archive of the given format on top of a binary stream. Entries
+    are written to the stream as soon as they are added, so only the entry
+    currently being added is held in memory.
+
+    :param stream: Binary file object to write the archive to.
+    :param output_format: One of tar, tar.gz or zip.
+    :returns: Archive with add(path, data, mode), add_link(path, target) and
+              close() methods.
+    :raises: ValueError: If the output format is not supported.
+    """
+    if output_format == 'tar':
+        return TarArchive(stream)
+    elif output_format == 'tar.gz':
+        return TarArchive(stream, compress=True)
+    elif output_format == 'zip':
+        return ZipArchive(stream)
+    raise ValueError('Value of --output-format should be one of %s' % ', '.join(FORMATS))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import calendar
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import jwt
+import requests
+
+from github.Auth import Auth
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default directory of the caches of pygithubctl.
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pygithubctl')
+
+# Seconds before its expiry an installation token is no longer used.
+EXPIRY_MARGIN = 300
+
+
+class FileLock(object):
+    """
+    Exclusive lock on a file shared by the processes on the same host; a no-op
+    on platforms without fcntl.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = open(self.path, 'a')
+        if fcntl:
+            fcntl.flock(self.stream.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if fcntl:
+            fcntl.flock(self.stream.fileno(), fcntl.LOCK_UN)
+        self.stream.close()
+
+
+def read_token(path):
+    """
+    Reads a cached installation token; tokens expiring within EXPIRY_MARGIN
+    seconds are ignored.
+
+    :returns: Tuple of the token and its expiry as epoch, or None.
+    """
+    try:
+        with open(path) as stream:
+            cached = json.load(stream)
+    except (IOError, OSError, ValueError):
+        return None
+    if cached.get('expires_at', 0) - EXPIRY_MARGIN <= time.time():
+        return None
+    return cached['token'], cached['expires_at']
+
+
+def write_token(path, token, expires_at):
+    """
+    Writes an installation token to the cache atomically, readable by the
+    owner only.
+    """
+    temporary = '{path}.{pid}'.format(path=path, pid=os.getpid())
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'w') as stream:
+        json.dump({'token': token, 'expires_at': expires_at}, stream)
+    os.rename(temporary, path)
+
+
+def create_installation_token(base_url, app_id, private_key, installation_id, verify=True):
+    """
+    Creates an installation access token of a GitHub App; signs a JSON Web
+    Token with the private key of the App and exchanges it for a token of the
+    installation.
+
+    :param base_url: GitHub API endpoint url.
+    :param app_id: ID of the GitHub App.
+    :param private_key: PEM encoded private key of the GitHub App.
+    :param installation_id: ID of the installation of the GitHub App.
+    :param verify: Enable or disable the SSL certificate verification.
+    :returns: Tuple of the token and its expiry as epoch.
+    :raises: requests.HTTPError: If GitHub refuses to create the token.
+    """
+    now = int(time.time())
+    claims = {'iat': now - 60, 'exp': now + 540, 'iss': str(app_id)}
+    signed = jwt.encode(claims, private_key, algorithm='RS256')
+    if isinstance(signed, bytes):
+        signed = signed.decode('ascii')
+    response = requests.post(
+        '{base_url}/app/installations/{id}/access_tokens'.format(
+            base_url=base_url.rstrip('/'), id=installation_id),
+        headers={'Authorization': 'Bearer {jwt}'.format(jwt=signed),
+                 'Accept': 'application/vnd.github+json'},
+        verify=verify)
+    response.raise_for_status()
+    created = response.json()
+    expires_at = calendar.timegm(time.strptime(created['expires_at'], '%Y-%m-%dT%H:%M:%SZ'))
+    return created['token'], expires_at
+
+
+def get_installation_token(base_url, app_id, private_key, installation_id, verify=True,
+                           cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Gets an installation access token of a GitHub App. Tokens are cached on
+    disk until shortly before they expire, so only the first invocation in an
+    hour pays for signing and the extra request. Concurrent processes serialize
+    on a lock file, so a single token is created and shared by all of them.
+
+    :param base_url: GitHub API endpoint url.
+    :param app_id: ID of the GitHub App.
+    :param private_key: PEM encoded private key of the GitHub App.
+    :param installation_id: ID of the installation of the GitHub App.
+    :param verify: Enable or disable the SSL certificate verification.
+    :param cache_dir: Directory of the caches of pygithubctl.
+    :returns: Tuple of the token and its expiry as epoch.
+    :raises: requests.HTTPError: If GitHub refuses to create the token.
+    """
+    directory = os.path.join(cache_dir, 'tokens')
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+    key = hashlib.sha1('{0} {1} {2}'.format(base_url, app_id, installation_id).encode('utf-8'))
+    path = os.path.join(directory, key.hexdigest() + '.json')
+
+    cached = read_token(path)
+    if cached:
+        return cached
+    with FileLock(path + '.lock'):
+        cached = read_token(path)
+        if cached:
+            return cached
+        logger.debug('Creating installation token of GitHub App %s', app_id)
+        token, expires_at = create_installation_token(
+            base_url, app_id, private_key, installation_id, verify)
+        write_token(path, token, expires_at)
+        return token, expires_at
+
+
+class InstallationTokenAuth(Auth):
+    """
+    Authentication of PyGithub with the installation token of a GitHub App.
+    The token is looked up again shortly before it expires, so long running
+    commands like watch keep working past the one hour lifetime of a token.
+    """
+
+    def __init__(self, base_url, app_id, private_key, installation_id, verify=True,
+                 cache_dir=DEFAULT_CACHE_DIR):
+        self.settings = (base_url, app_id, private_key, installation_id, verify, cache_dir)
+        self.cached = None
+        self.lock = threading.Lock()
+
+    @property
+    def token_type(self):
+        return 'token'
+
+    @property
+    def token(self):
+        with self.lock:
+            if not self.cached or self.cached[1] - EXPIRY_MARGIN <= time.time():
+                self.cached = get_installation_token(*self.settings)
+            return self.cached[0]
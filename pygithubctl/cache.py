@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import errno
+import json
+import logging
+import os
+import re
+import zlib
+
+from lister import TreeEntry
+from lister import join
+from writer import write_file
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default bound of the size of the tree cache on the disk.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Only full object names are cached, since abbreviated ones are ambiguous.
+SHA = re.compile('^[0-9a-f]{40}$')
+
+
+class TreeCache(object):
+    """
+    Caches the tree listings of the repositories on the disk. Git objects are
+    immutable, so the tree of a directory at a commit and the files under a
+    tree never change once listed. Commits map the paths of the directories to
+    their trees, and trees map to the files under them, with paths relative to
+    the tree, so a tree is shared by all the commits and paths it appears at.
+    Every record is compressed JSON named after its sha. Once the cache grows
+    beyond max_bytes, the least recently used records are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param directory: Directory of the cache.
+        :param max_bytes: Bound of the size of the cache on the disk.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get_tree(self, commit, path):
+        """
+        :returns: sha of the tree of the directory at the commit, or None.
+        """
+        record = self.read('commits', commit)
+        return record.get(path) if record else None
+
+    def put_tree(self, commit, path, tree):
+        if not SHA.match(commit):
+            return
+        record = self.read('commits', commit) or {}
+        record[path] = tree
+        self.write('commits', commit, record)
+
+    def get_entries(self, tree, prefix):
+        """
+        :returns: List of TreeEntry instances of the files under the tree, with
+                  their paths below the prefix, or None.
+        """
+        record = self.read('trees', tree)
+        if record is None:
+            return None
+        return [TreeEntry(join(prefix, path), mode, type, sha, size)
+                for path, mode, type, sha, size in record]
+
+    def put_entries(self, tree, prefix, entries):
+        start = len(prefix) + 1 if prefix else 0
+        self.write('trees', tree, [[entry.path[start:], entry.mode, entry.type, entry.sha,
+                                    entry.size] for entry in entries])
+        self.evict()
+
+    def get_path(self, kind, sha):
+        return os.path.join(self.directory, kind, sha[:2], sha)
+
+    def read(self, kind, sha):
+        if not SHA.match(sha):
+            return None
+        path = self.get_path(kind, sha)
+        try:
+            with open(path, 'rb') as stream:
+                record = json.loads(zlib.decompress(stream.read()).decode('utf-8'))
+            os.utime(path, None)
+        except (IOError, OSError, ValueError, zlib.error):
+            return None
+        return record
+
+    def write(self, kind, sha, record):
+        path = self.get_path(kind, sha)
+        data = zlib.compress(json.dumps(record, separators=(',', ':')).encode('utf-8'))
+        try:
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError as exception:
+                if exception.errno != errno.EEXIST:
+                    raise
+            write_file(path, data)
+        except OSError as exception:
+            logger.debug('Failed to cache %s %s: %s', kind, sha, exception)
+
+    def evict(self):
+        """
+        Removes the least recently used records until the cache fits max_bytes.
+        """
+        evict(self.directory, self.max_bytes)
+
+
+def evict(directory, max_bytes):
+    """
+    Removes the least recently used records of a cache directory, i.e. the
+    files named after a sha with the oldest modification time, until the
+    records fit max_bytes.
+
+    :param directory: Directory of the cache.
+    :param max_bytes: Bound of the size of the cache on the disk.
+    :returns: None
+    :raises: None
+    """
+    records = []
+    for parent, _, names in os.walk(directory):
+        for name in names:
+            if SHA.match(name):
+                path = os.path.join(parent, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                records.append((status.st_mtime, status.st_size, path))
+    size = sum(record[1] for record in records)
+    for _, length, path in sorted(records):
+        if size <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        size -= length
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import base64
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+
+def get_git_environment(credentials=None, verify=True):
+    """
+    Builds the environment of the git processes. The credentials are passed
+    as an extra HTTP header through the GIT_CONFIG_* variables, so they never
+    appear in the URL, the command line or the configuration of the clone.
+
+    :param credentials: "<username>:<password or token>" to authenticate over HTTPS, or None.
+    :param verify: Enable or disable the SSL certificate verification.
+    :returns: map of the environment variables.
+    :raises: None
+    """
+    settings = [('advice.detachedHead', 'false')]
+    if credentials:
+        encoded = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+        settings.append(('http.extraHeader', 'Authorization: Basic ' + encoded))
+    if not verify:
+        settings.append(('http.sslVerify', 'false'))
+    environment = dict(os.environ, GIT_TERMINAL_PROMPT='0', GIT_CONFIG_COUNT=str(len(settings)))
+    for index, (key, value) in enumerate(settings):
+        environment['GIT_CONFIG_KEY_%d' % index] = key
+        environment['GIT_CONFIG_VALUE_%d' % index] = value
+    return environment
+
+
+def git(work, environment, *args):
+    logger.debug('git %s', ' '.join(args))
+    subprocess.check_call(('git', '-C', work) + args, env=environment)
+
+
+def clone_directory(url, sha, source, target, environment=None):
+    """
+    Downloads a directory of the Git repository at the given commit with the
+    Git protocol instead of the API: a shallow fetch of the single commit,
+    filtered to leave out every blob, followed by a sparse checkout of the
+    directory, which fetches the blobs under it in a single pack. The files
+    are then moved to the destination with the same layout as
+    download_directory, i.e. under their repository path.
+
+    :param url: URL of the Git repository, e.g. https://github.com/owner/repository.git
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param source: Path of the directory on Git repository.
+    :param target: Path of target directory on the local filesystem or disk.
+    :param environment: Environment of the git processes from get_git_environment.
+    :returns: None
+    :raises: CalledProcessError: If any git command fails.
+    :raises: ValueError: If no directory exists with that path
+    """
+    source = source.strip('/')
+    environment = environment or get_git_environment()
+    if not os.path.isdir(target):
+        os.makedirs(target)
+    # The clone lives inside the destination, so the files can be renamed
+    # into place instead of being copied across file systems.
+    work = tempfile.mkdtemp(prefix='.pygithubctl-', dir=target)
+    try:
+        git(work, environment, 'init', '-q')
+        git(work, environment, 'remote', 'add', 'origin', url)
+        git(work, environment, 'config', 'remote.origin.promisor', 'true')
+        git(work, environment, 'config', 'remote.origin.partialclonefilter', 'blob:none')
+        git(work, environment, 'config', 'core.sparseCheckout', 'true')
+        with open(os.path.join(work, '.git', 'info', 'sparse-checkout'), 'w') as stream:
+            stream.write('/{source}/\n'.format(source=source) if source else '/*\n')
+        git(work, environment, 'fetch', '-q', '--depth', '1', '--filter', 'blob:none',
+            '--no-tags', 'origin', sha)
+        git(work, environment, 'checkout', '-q', sha)
+        checkout = os.path.join(work, source)
+        if not os.path.isdir(checkout) or os.path.islink(checkout):
+            raise ValueError('No directory exists with that path: %s' % source)
+        move_tree(checkout, os.path.join(target, source))
+    finally:
+        shutil.rmtree(work)
+
+
+def move_tree(source, target):
+    """
+    Moves the files under a directory into another directory, overwriting the
+    files which already exist there and keeping the others. Symbolic links to
+    directories are moved as links, like the other files.
+    """
+    for root, directories, files in os.walk(source):
+        if root == source and '.git' in directories:
+            directories.remove('.git')
+        destination = os.path.join(target, os.path.relpath(root, source))
+        if not os.path.isdir(destination):
+            os.makedirs(destination)
+        links = [name for name in directories if os.path.islink(os.path.join(root, name))]
+        for name in links:
+            directories.remove(name)
+        for name in files + links:
+            os.rename(os.path.join(root, name), os.path.join(destination, name))
@@ -20,9 +20,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import atexit
 import logging
 import sys
 
+import queue
+
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+
 
 def configure_logging_console(logger, format):
     """
@@ -54,7 +60,71 @@ def configure_logging_file(logger, format, file):
     :returns: Logger instance after enabling file logging.
     :raises: None
     """
+    formatter = logging.Formatter(format)
     handler = logging.FileHandler(file)
-    handler.setFormatter(format)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    return logger
+
+
+def redirect_logging_console(logger, stream):
+    """
+    Redirect the console logging of the logger from stdout to another stream;
+    used when stdout carries the output of the command itself.
+
+    :param logger: Logger instance configured for console logging.
+    :param stream: Stream to write the log records to, e.g. sys.stderr.
+    :returns: Logger instance after redirecting console logging.
+    :raises: None
+    """
+    handlers = list(logger.handlers)
+    for handler in logger.handlers:
+        listener = getattr(handler, 'listener', None)
+        if listener:
+            handlers.extend(listener.handlers)
+    for handler in handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.stream = stream
+    return logger
+
+
+def configure_logging_queue(logger):
+    """
+    Configure asynchronous logging; the handlers of the logger are moved behind
+    a queue drained by a background thread, so logging a record no longer waits
+    for the console or the file. The queue is flushed when the interpreter
+    exits.
+
+    :param logger: Logger instance with console or file logging configured.
+    :returns: Logger instance after enabling asynchronous logging.
+    :raises: None
+    """
+    handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+    if not handlers:
+        return logger
+    records = queue.Queue(-1)
+    handler = QueueHandler(records)
+    handler.listener = QueueListener(records, *handlers, respect_handler_level=True)
+    for existing in handlers:
+        logger.removeHandler(existing)
     logger.addHandler(handler)
+    handler.listener.start()
+    atexit.register(stop_logging_queue, logger)
+    return logger
+
+
+def stop_logging_queue(logger):
+    """
+    Stop asynchronous logging after writing out the queued records; does
+    nothing if asynchronous logging is not configured or already stopped.
+
+    :param logger: Logger instance with asynchronous logging configured.
+    :returns: Logger instance after stopping asynchronous logging.
+    :raises: None
+    """
+    for handler in logger.handlers:
+        listener = getattr(handler, 'listener', None)
+        if listener and not getattr(handler, 'stopped', False):
+            handler.stopped = True
+            listener.stop()
     return logger
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+
+import queue
+
+# Default number of concurrent network requests.
+DEFAULT_WORKERS = 8
+
+# Default budget of file content held in memory by the pipeline at once.
+DEFAULT_MAX_INFLIGHT_BYTES = 64 * 1024 * 1024
+
+# Marks the end of the entries in a queue.
+DONE = object()
+
+# Seconds a blocked stage waits before checking whether the pipeline stopped.
+POLL_INTERVAL = 0.1
+
+
+def encoded_size(size):
+    """
+    Estimates the size of the base64 encoded content of a blob of the given
+    size, the way GitHub returns it: four characters per three bytes, split
+    into lines of 60 characters.
+    """
+    encoded = 4 * ((size + 2) // 3)
+    return encoded + encoded // 60
+
+
+class Cancelled(Exception):
+    """
+    Raised inside the stages of a pipeline once another stage has failed
+    """
+    pass
+
+
+class ByteBudget(object):
+    """
+    Counting semaphore over bytes. A single entry larger than the whole budget
+    is charged the whole budget, so it runs alone instead of blocking forever.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.cancelled = False
+        self.condition = threading.Condition()
+
+    def acquire(self, size):
+        size = min(size, self.limit)
+        with self.condition:
+            while self.used + size > self.limit and not self.cancelled:
+                self.condition.wait(POLL_INTERVAL)
+            if self.cancelled:
+                raise Cancelled()
+            self.used += size
+        return size
+
+    def release(self, size):
+        with self.condition:
+            self.used -= size
+            self.condition.notify_all()
+
+    def cancel(self):
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify_all()
+
+
+class Pipeline(object):
+    """
+    Runs the entries through network, decode and write stages connected by
+    bounded queues. A number of worker threads fetch the entries concurrently,
+    one thread decodes them and the calling thread writes them. An entry is
+    charged against a global budget before it is fetched, for both its fetched
+    base64 content and its decoded bytes, which are held together while it is
+    decoded. The share of the fetched content is released once it is decoded
+    and the rest once it is written, so the memory held by the pipeline stays
+    within the budget however large the files are. With ordered set, the entries are written
+    in the order they were given; since the budget is acquired in that order,
+    the next entry to write always holds its share and the pipeline cannot
+    deadlock waiting for it.
+    """
+
+    def __init__(self, fetch, decode, write, workers=DEFAULT_WORKERS,
+                 max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES, ordered=False):
+        self.fetch = fetch
+        self.decode = decode
+        self.write = write
+        self.workers = max(1, workers)
+        self.budget = ByteBudget(max(1, max_inflight_bytes))
+        self.ordered = ordered
+        self.fetched = queue.Queue(self.workers * 2)
+        self.decoded = queue.Queue(self.workers)
+        self.pending = queue.Queue(self.workers)
+        self.stopped = threading.Event()
+        self.error = None
+
+    def run(self, entries):
+        """
+        Runs all the entries through the pipeline and returns once the last
+        one is written. The first exception raised by any stage stops the
+        pipeline and is raised again here.
+
+        :param entries: Iterable of entries; each must have a size attribute.
+        :returns: None
+        :raises: Exception raised by the fetch, decode or write stage.
+        """
+        threads = [threading.Thread(target=self.guard, args=(self.produce, entries))]
+        threads.extend(threading.Thread(target=self.guard, args=(self.download,))
+                       for _ in range(self.workers))
+        threads.append(threading.Thread(target=self.guard, args=(self.convert,)))
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        self.guard(self.store)
+        self.stop()
+        for thread in threads:
+            thread.join()
+        if self.error:
+            raise self.error
+
+    def guard(self, stage, *args):
+        try:
+            stage(*args)
+        except Cancelled:
+            pass
+        except Exception as exception:
+            if self.error is None:
+                self.error = exception
+            self.stop()
+
+    def stop(self):
+        self.stopped.set()
+        self.budget.cancel()
+
+    def put(self, target, item):
+        while True:
+            if self.stopped.is_set():
+                raise Cancelled()
+            try:
+                return target.put(item, timeout=POLL_INTERVAL)
+            except queue.Full:
+                pass
+
+    def get(self, source):
+        while True:
+            if self.stopped.is_set():
+                raise Cancelled()
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+
+    def produce(self, entries):
+        for sequence, entry in enumerate(entries):
+            size = entry.size or 0
+            reserved = self.budget.acquire(size + encoded_size(size))
+            self.put(self.fetched, (sequence, entry, reserved))
+        for _ in range(self.workers):
+            self.put(self.fetched, DONE)
+
+    def download(self):
+        while True:
+            item = self.get(self.fetched)
+            if item is DONE:
+                return self.put(self.decoded, DONE)
+            sequence, entry, reserved = item
+            self.put(self.decoded, (sequence, entry, reserved, self.fetch(entry)))
+
+    def convert(self):
+        remaining = self.workers
+        while remaining:
+            item = self.get(self.decoded)
+            if item is DONE:
+                remaining -= 1
+                continue
+            sequence, entry, reserved, raw = item
+            data = self.decode(raw)
+            del item, raw
+            # Only the decoded bytes are held from now on.
+            decoded = min(entry.size or 0, reserved)
+            self.budget.release(reserved - decoded)
+            self.put(self.pending, (sequence, entry, decoded, data))
+        self.put(self.pending, DONE)
+
+    def store(self):
+        waiting = {}
+        expected = 0
+        while True:
+            item = self.get(self.pending)
+            if item is DONE:
+                return
+            if not self.ordered:
+                self.commit(*item[1:])
+                continue
+            waiting[item[0]] = item[1:]
+            while expected in waiting:
+                self.commit(*waiting.pop(expected))
+                expected += 1
+
+    def commit(self, entry, reserved, data):
+        self.write(entry, data)
+        self.budget.release(reserved)
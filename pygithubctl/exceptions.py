@@ -44,3 +44,19 @@ class AuthenticationException(Error):
     with the provided credentials or access token
     """
     pass
+
+
+class IncompleteListingException(Error):
+    """
+    Raised when the listing of a tree on the GitHub server is truncated and
+    cannot be completed by listing its subtrees separately
+    """
+    pass
+
+
+class ChecksumException(Error):
+    """
+    Raised when the checksum of a downloaded file does not match the checksum
+    published for it
+    """
+    pass
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import logging
+import threading
+import time
+
+import queue
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default share of the requests which may be duplicated by hedging.
+DEFAULT_MAX_SHARE = 0.05
+
+# Number of latencies measured before requests are hedged.
+MIN_SAMPLES = 20
+
+# Number of most recent latencies the percentile is computed from.
+MAX_SAMPLES = 1000
+
+
+class LatencyTracker(object):
+    """
+    Keeps the latencies of the most recent requests of the run and computes
+    their percentiles.
+    """
+
+    def __init__(self, size=MAX_SAMPLES):
+        self.samples = collections.deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percentile, minimum=MIN_SAMPLES):
+        """
+        :returns: The latency at the percentile in seconds, or None with fewer
+                  than minimum samples.
+        """
+        with self.lock:
+            if len(self.samples) < minimum:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))
+        return ordered[index]
+
+
+class Hedger(object):
+    """
+    Hedges idempotent requests to cut the tail latency: when a request has not
+    completed after the given percentile of the latencies measured during the
+    run, a duplicate request is issued and the result of whichever completes
+    first is returned. At most max_share of the requests are duplicated, so
+    hedging never takes more than that share of the rate limit.
+    """
+
+    def __init__(self, percentile=95, max_share=DEFAULT_MAX_SHARE):
+        """
+        :param percentile: Percentile of the latencies after which to hedge.
+        :param max_share: Maximum share of the requests which may be duplicated.
+        """
+        self.percentile = percentile
+        self.max_share = max_share
+        self.tracker = LatencyTracker()
+        self.requests = 0
+        self.hedges = 0
+        self.lock = threading.Lock()
+
+    def call(self, function, *args):
+        """
+        Calls the function, hedging the call if it is slow. The function must
+        be idempotent, e.g. a GET request.
+
+        :param function: Function issuing the request.
+        :param args: Arguments of the function.
+        :returns: Result of the first call which succeeds.
+        :raises: Exception raised by the call, if every call fails.
+        """
+        with self.lock:
+            self.requests += 1
+        delay = self.tracker.percentile(self.percentile)
+        results = queue.Queue()
+        self.start(results, function, args)
+        attempts = 1
+        try:
+            succeeded, value = results.get(timeout=delay)
+        except queue.Empty:
+            if self.allow():
+                logger.debug('Hedging request after %.3f seconds', delay)
+                self.start(results, function, args)
+                attempts += 1
+            succeeded, value = results.get()
+        while not succeeded and attempts > 1:
+            attempts -= 1
+            succeeded, value = results.get()
+        if not succeeded:
+            raise value
+        return value
+
+    def allow(self):
+        with self.lock:
+            if self.hedges + 1 > self.requests * self.max_share:
+                return False
+            self.hedges += 1
+            return True
+
+    def start(self, results, function, args):
+        def run():
+            started = time.time()
+            try:
+                value = function(*args)
+            except Exception as exception:
+                results.put((False, exception))
+                return
+            self.tracker.record(time.time() - started)
+            results.put((True, value))
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
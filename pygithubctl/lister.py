@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import logging
+import threading
+
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+from exceptions import IncompleteListingException
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# A file in the listing of a tree; path is relative to the repository root.
+TreeEntry = namedtuple('TreeEntry', ['path', 'mode', 'type', 'sha', 'size'])
+
+
+def resolve_tree(repository, sha, source, cache=None):
+    """
+    Resolves the sha of the tree object of a directory at the given commit by
+    walking down the trees from the root tree, one request per path component.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param source: Path of the directory; empty or / for the repository root.
+    :param cache: TreeCache the tree is looked up in and added to, or None.
+    :returns: sha (str): sha of the tree object of the directory.
+    :raises: ValueError: If no directory exists with that path
+    """
+    path = '/'.join(name for name in source.split('/') if name)
+    tree = cache.get_tree(sha, path) if cache else None
+    if tree:
+        return tree
+    tree = repository.get_git_commit(sha).tree.sha
+    for name in [name for name in source.split('/') if name]:
+        elements = [element for element in repository.get_git_tree(tree).tree
+                    if element.path == name and element.type == 'tree']
+        if not elements:
+            raise ValueError('No directory exists with that path: %s' % source)
+        tree = elements[0].sha
+    if cache:
+        cache.put_tree(sha, path, tree)
+    return tree
+
+
+def list_tree(repository, sha, source, workers=8, cache=None):
+    """
+    Lists the files under a directory of the Git repository recursively, sorted
+    by path. The whole directory is listed with a single recursive tree request
+    when possible. GitHub truncates recursive listings of very large trees, in
+    which case the tree is listed non-recursively and each of its subtrees is
+    listed separately, level by level, with the requests of a level executed
+    in parallel. Every entry of a truncated listing must be found again in the
+    listings of its subtrees, otherwise the listing is considered incomplete.
+    With a cache, a directory listed before at the same commit is listed
+    without any request.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param source: Path of the directory on Git repository hosted on GitHub server.
+    :param workers: Number of concurrent requests for listing subtrees.
+    :param cache: TreeCache the listing is looked up in and added to, or None.
+    :returns: List of TreeEntry instances of the files.
+    :raises: IncompleteListingException: If a listing cannot be completed.
+    """
+    prefix = '/'.join(name for name in source.split('/') if name)
+    tree = resolve_tree(repository, sha, source, cache)
+    if cache:
+        entries = cache.get_entries(tree, prefix)
+        if entries is not None:
+            logger.debug('Listing of %s found in the cache', prefix or '/')
+            return entries
+    pending = [(tree, prefix)]
+    entries = []
+    partial = []
+    pool = ThreadPool(max(1, workers))
+    try:
+        while pending:
+            results = pool.map(lambda tree: list_level(repository, *tree), pending)
+            pending = []
+            for found, truncated, subtrees in results:
+                entries.extend(found)
+                partial.extend(truncated)
+                pending.extend(subtrees)
+    finally:
+        pool.close()
+    check_complete(entries, partial)
+    entries.sort(key=lambda entry: entry.path)
+    if cache:
+        cache.put_entries(tree, prefix, entries)
+    return entries
+
+
+def list_level(repository, sha, prefix):
+    """
+    Lists a tree recursively. If GitHub truncates the listing, the tree is
+    listed non-recursively instead and its subtrees are returned to be listed
+    separately, along with the entries of the truncated listing.
+
+    :returns: Tuple of the entries, the truncated entries and the subtrees.
+    :raises: IncompleteListingException: If the tree itself is truncated.
+    """
+    tree = repository.get_git_tree(sha, recursive=True)
+    if not tree.truncated:
+        return get_entries(tree, prefix), [], []
+    logger.debug('Listing of %s is truncated; listing its subtrees', prefix or '/')
+    shallow = repository.get_git_tree(sha)
+    if shallow.truncated:
+        raise IncompleteListingException('Listing of %s is truncated' % (prefix or '/'))
+    subtrees = [(element.sha, join(prefix, element.path))
+                for element in shallow.tree if element.type == 'tree']
+    return get_entries(shallow, prefix), get_entries(tree, prefix), subtrees
+
+
+def get_entries(tree, prefix):
+    """
+    Converts the blob elements of a tree listing to TreeEntry instances; the
+    submodules are skipped.
+    """
+    return [TreeEntry(join(prefix, element.path), element.mode, element.type,
+                      element.sha, element.size)
+            for element in tree.tree if element.type == 'blob']
+
+
+def check_complete(entries, partial):
+    """
+    Checks that every entry of the truncated listings has been found again in
+    the listings of the subtrees.
+
+    :raises: IncompleteListingException: If an entry is missing.
+    """
+    listed = set((entry.path, entry.sha) for entry in entries)
+    missing = [entry.path for entry in partial if (entry.path, entry.sha) not in listed]
+    if missing:
+        raise IncompleteListingException('Listing is missing %d entries, e.g. %s'
+                                         % (len(missing), missing[0]))
+
+
+def join(prefix, path):
+    return '/'.join((prefix, path)) if prefix else path
+
+
+def find_entry(repository, sha, source):
+    """
+    Finds the listing entry of a single file by listing its parent directory,
+    without requesting the content of the file.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param source: Path of the file on Git repository hosted on GitHub server.
+    :returns: TreeEntry instance of the file.
+    :raises: ValueError: If no file exists with that path
+    """
+    parent, _, name = source.strip('/').rpartition('/')
+    tree = repository.get_git_tree(resolve_tree(repository, sha, parent))
+    for element in tree.tree:
+        if element.path == name and element.type == 'blob':
+            return TreeEntry(join(parent, name), element.mode, element.type,
+                             element.sha, element.size)
+    raise ValueError('No file exists with that path: %s' % source)
+
+
+class CountingRepository(object):
+    """
+    Wraps a repository and counts the calls of its get_ methods, i.e. the API
+    requests made through it, e.g. for listing a tree.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.repository, name)
+        if not name.startswith('get_') or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self.lock:
+                self.requests += 1
+            return attribute(*args, **kwargs)
+        return call
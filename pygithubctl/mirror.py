@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import base64
+import binascii
+import logging
+import subprocess
+import threading
+
+from collections import namedtuple
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Objects read from the mirror, shaped like the PyGithub objects used by
+# pygithubctl, so the mirror can stand in for the repository.
+Commit = namedtuple('Commit', ['sha', 'tree'])
+Tree = namedtuple('Tree', ['sha', 'tree', 'truncated'])
+Element = namedtuple('Element', ['path', 'mode', 'type', 'sha', 'size'])
+Blob = namedtuple('Blob', ['sha', 'size', 'content'])
+Content = namedtuple('Content', ['path', 'type', 'sha', 'size', 'content'])
+
+# Git object type of the tree entry modes.
+TYPES = {'040000': 'tree', '160000': 'commit'}
+
+
+class MissingObject(Exception):
+    """
+    Raised when an object does not exist in the mirror
+    """
+    pass
+
+
+class Mirror(object):
+    """
+    Reads refs, trees and blobs from a local bare mirror of the repository
+    through persistent "git cat-file --batch" and "--batch-check" processes,
+    so each read is a round trip over a pipe instead of an API request. The
+    mirror answers the subset of the Repository API used for fetching; when
+    an object is missing from the mirror, the call is passed on to the API
+    repository returned by the fallback function, which is only invoked then.
+    The calls passed on, i.e. the API requests made, are counted in requests.
+    """
+
+    def __init__(self, path, fallback=None):
+        """
+        :param path: Path of the bare mirror, e.g. /srv/mirrors/repository.git
+        :param fallback: Function returning the API repository, or None.
+        :raises: ValueError: If the path is not a Git repository.
+        """
+        if subprocess.call(['git', '--git-dir', path, 'rev-parse', '--git-dir'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) != 0:
+            raise ValueError('Mirror %s is not a Git repository' % path)
+        self.path = path
+        self.fallback = fallback
+        self.repository = None
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.batch = self.open('--batch')
+        self.check = self.open('--batch-check')
+
+    def open(self, mode):
+        return subprocess.Popen(['git', '--git-dir', self.path, 'cat-file', mode],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def close(self):
+        for process in (self.batch, self.check):
+            process.stdin.close()
+            process.wait()
+
+    def request(self, process, name):
+        if process.poll() is not None:
+            raise IOError('git cat-file of mirror %s exited with status %d'
+                          % (self.path, process.returncode))
+        process.stdin.write(name.encode('utf-8') + b'\n')
+        process.stdin.flush()
+        header = process.stdout.readline().decode('utf-8').split()
+        if len(header) != 3:
+            raise MissingObject(name)
+        return header
+
+    def read(self, name):
+        """
+        Reads an object of the mirror.
+
+        :param name: sha or revision expression of the object.
+        :returns: Tuple of the sha, the type and the content of the object.
+        :raises: MissingObject: If the object does not exist in the mirror.
+        """
+        with self.lock:
+            sha, type, size = self.request(self.batch, name)
+            data = self.batch.stdout.read(int(size) + 1)[:-1]
+        return sha, type, data
+
+    def size(self, sha):
+        with self.lock:
+            return int(self.request(self.check, sha)[2])
+
+    def resolve(self, tag):
+        """
+        Get the commit sha of a branch or tag from the mirror; branches are
+        looked up first, the same way as get_sha does.
+
+        :param tag: Name of branch or tag name of the Git repository.
+        :returns: sha (str) of the commit, or None if the mirror has no such ref.
+        :raises: None
+        """
+        for ref in ('refs/heads/', 'refs/tags/'):
+            try:
+                return self.read(ref + tag + '^{commit}')[0]
+            except MissingObject:
+                pass
+        return None
+
+    def api(self):
+        if self.fallback is None:
+            return None
+        with self.lock:
+            if self.repository is None:
+                self.repository = self.fallback()
+        return self.repository
+
+    def delegate(self, name, *args, **kwargs):
+        repository = self.api()
+        if repository is None:
+            raise MissingObject(args[0])
+        logger.debug('%s %s is missing from the mirror; using the API', name, args[0])
+        with self.lock:
+            self.requests += 1
+        return getattr(repository, name)(*args, **kwargs)
+
+    def get_git_commit(self, sha):
+        try:
+            sha, _, data = self.read(sha)
+        except MissingObject:
+            return self.delegate('get_git_commit', sha)
+        tree = data.split(b'\n', 1)[0].split(b' ')[1].decode('ascii')
+        return Commit(sha, Tree(tree, [], False))
+
+    def get_git_tree(self, sha, recursive=False):
+        try:
+            elements = self.list(sha, '', recursive)
+        except MissingObject:
+            return self.delegate('get_git_tree', sha, recursive=recursive)
+        return Tree(sha, elements, False)
+
+    def get_git_blob(self, sha):
+        try:
+            sha, _, data = self.read(sha)
+        except MissingObject:
+            return self.delegate('get_git_blob', sha)
+        return Blob(sha, len(data), base64.b64encode(data))
+
+    def get_contents(self, path, ref=None):
+        try:
+            sha, _, data = self.read('{ref}:{path}'.format(ref=ref, path=path.strip('/')))
+        except MissingObject:
+            return self.delegate('get_contents', path, ref=ref)
+        return Content(path.strip('/'), 'file', sha, len(data), base64.b64encode(data))
+
+    def list(self, sha, prefix, recursive):
+        """
+        Lists a tree object of the mirror, recursively if requested.
+
+        :raises: MissingObject: If the tree or any subtree is missing.
+        """
+        elements = []
+        for mode, name, child in parse_tree(self.read(sha)[2]):
+            path = prefix + name
+            type = TYPES.get(mode, 'blob')
+            size = self.size(child) if type == 'blob' else None
+            elements.append(Element(path, mode, type, child, size))
+            if recursive and type == 'tree':
+                elements.extend(self.list(child, path + '/', recursive))
+        return elements
+
+
+def parse_tree(data):
+    """
+    Parses the content of a Git tree object; a sequence of "<mode> <name>"
+    followed by a NUL byte and the 20 bytes of the object id.
+
+    :param data: Content of the tree object.
+    :returns: Generator of mode, name and sha tuples.
+    :raises: None
+    """
+    offset = 0
+    while offset < len(data):
+        space = data.index(b' ', offset)
+        nul = data.index(b'\0', space)
+        mode = data[offset:space].decode('ascii').zfill(6)
+        name = data[space + 1:nul].decode('utf-8')
+        sha = data[nul + 1:nul + 21]
+        yield mode, name, binascii.hexlify(sha).decode('ascii')
+        offset = nul + 21
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+
+import requests
+
+from cache import evict
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default bound of the size of the cache of the proxy on the disk.
+DEFAULT_PROXY_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Requests addressing an object by its full sha, whose responses never change.
+IMMUTABLE = re.compile(
+    r'^/repos/([^/]+/[^/]+)/(git/(blobs|trees|commits)|tarball|zipball)/[0-9a-f]{40}(\?.*)?$')
+
+# Requests of a repository itself, which tell whether a client may read it.
+REPOSITORY = re.compile(r'^/repos/([^/]+/[^/]+)/?$')
+
+# Seconds the access of a client to a repository is remembered.
+ACCESS_TTL = 60
+
+# Request headers forwarded to GitHub; conditional requests answered with
+# 304 Not Modified do not count against the rate limit.
+REQUEST_HEADERS = ('Authorization', 'Accept', 'User-Agent', 'If-None-Match',
+                   'If-Modified-Since')
+
+# Response headers of GitHub forwarded to the clients.
+RESPONSE_HEADERS = ('Content-Type', 'Link', 'ETag', 'Last-Modified', 'X-GitHub-Request-Id',
+                    'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset',
+                    'X-OAuth-Scopes')
+
+
+class CacheProxy(object):
+    """
+    Pull-through cache of the GitHub API shared by the hosts of a fleet. The
+    responses of the blob, tree, commit and archive requests addressed by a
+    full sha never change, so they are cached on the disk; N clients requesting
+    the same object at once wait for a single request to GitHub. A cached
+    object is only served to a client whose credentials can read the
+    repository, which is checked with a request of the repository and
+    remembered for ACCESS_TTL seconds. Every other request is passed through
+    with the credentials of the client. The URLs of GitHub in the responses are
+    rewritten to the URL of the proxy, so the clients keep talking to it.
+    """
+
+    def __init__(self, base_url, directory, max_bytes=DEFAULT_PROXY_MAX_BYTES, verify=True):
+        """
+        :param base_url: URL of the GitHub API the proxy fronts.
+        :param directory: Directory of the cache.
+        :param max_bytes: Bound of the size of the cache on the disk.
+        :param verify: Enable or disable the SSL certificate verification.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        self.session.verify = verify
+        self.inflight = {}
+        self.access = {}
+        self.lock = threading.Lock()
+
+    def get(self, path, headers):
+        """
+        Answers a GET request, from the cache for an immutable object.
+
+        :param path: Path and query of the request, relative to the API.
+        :param headers: Headers of the request.
+        :returns: Tuple of the status, the headers and a file-like body.
+        :raises: requests.RequestException: If GitHub cannot be reached.
+        """
+        forwarded = dict((name, headers[name]) for name in REQUEST_HEADERS if headers.get(name))
+        match = IMMUTABLE.match(path)
+        if not match:
+            response = self.session.get(self.base_url + path, headers=forwarded)
+            repository = REPOSITORY.match(path)
+            if repository and response.status_code == 200:
+                self.grant(repository.group(1), forwarded)
+            return response.status_code, get_headers(response), Body(response.content)
+        denied = self.authorize(match.group(1), forwarded)
+        if denied:
+            return denied
+        key = '\n'.join((path, forwarded.get('Accept', '')))
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        record = os.path.join(self.directory, name[:2], name)
+        while True:
+            cached = self.read(record)
+            if cached:
+                logger.debug('Cache hit: %s', path)
+                return cached
+            with self.lock:
+                event = self.inflight.get(name)
+                leader = event is None
+                if leader:
+                    event = self.inflight[name] = threading.Event()
+            if not leader:
+                # Another client is fetching the object; read it once cached,
+                # or fetch it again if the request failed.
+                event.wait()
+                continue
+            try:
+                return self.fetch(path, forwarded, record)
+            finally:
+                with self.lock:
+                    del self.inflight[name]
+                event.set()
+
+    def authorize(self, repository, headers):
+        """
+        Checks that the credentials of a client can read the repository, with
+        a request of the repository unless a recent one succeeded.
+
+        :param repository: Owner and name of the repository, e.g. owner/name.
+        :param headers: Headers of the request forwarded to GitHub.
+        :returns: None if the client may read the repository, otherwise the
+                  tuple of the status, the headers and the body of the denial.
+        :raises: requests.RequestException: If GitHub cannot be reached.
+        """
+        key = get_access_key(repository, headers)
+        with self.lock:
+            granted = self.access.get(key)
+        if granted and time.time() - granted < ACCESS_TTL:
+            return None
+        credentials = dict((name, headers[name]) for name in ('Authorization', 'User-Agent')
+                           if name in headers)
+        response = self.session.get(self.base_url + '/repos/' + repository,
+                                    headers=credentials)
+        if response.status_code != 200:
+            logger.debug('Access to %s denied: %s', repository, response.status_code)
+            return response.status_code, get_headers(response), Body(response.content)
+        self.grant(repository, headers)
+        return None
+
+    def grant(self, repository, headers):
+        now = time.time()
+        with self.lock:
+            self.access[get_access_key(repository, headers)] = now
+            for key, granted in list(self.access.items()):
+                if now - granted >= ACCESS_TTL:
+                    del self.access[key]
+
+    def fetch(self, path, headers, record):
+        """
+        Fetches an immutable object from GitHub, streaming a successful
+        response into the cache before answering from it.
+        """
+        logger.info('Cache miss: %s', path)
+        response = self.session.get(self.base_url + path, headers=headers, stream=True)
+        if response.status_code != 200:
+            return response.status_code, get_headers(response), Body(response.content)
+        directory = os.path.dirname(record)
+        temporary = '{record}.{pid}.{thread}.tmp'.format(
+            record=record, pid=os.getpid(), thread=threading.current_thread().ident)
+        try:
+            try:
+                os.makedirs(directory)
+            except OSError as exception:
+                if exception.errno != errno.EEXIST:
+                    raise
+            with open(temporary, 'wb') as stream:
+                stream.write(json.dumps(get_headers(response)).encode('utf-8') + b'\n')
+                for chunk in response.iter_content(65536):
+                    stream.write(chunk)
+            os.rename(temporary, record)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        finally:
+            response.close()
+        evict(self.directory, self.max_bytes)
+        return self.read(record)
+
+    def read(self, record):
+        try:
+            stream = open(record, 'rb')
+        except IOError:
+            return None
+        headers = json.loads(stream.readline().decode('utf-8'))
+        try:
+            os.utime(record, None)
+        except OSError:
+            pass
+        return 200, headers, stream
+
+
+class Body(object):
+    """
+    File-like body of a response held in memory.
+    """
+
+    def __init__(self, content):
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def close(self):
+        pass
+
+
+def get_access_key(repository, headers):
+    """
+    Key of the access of a client to a repository; the credentials are only
+    kept hashed.
+    """
+    credentials = headers.get('Authorization', '').encode('utf-8')
+    return repository, hashlib.sha256(credentials).hexdigest()
+
+
+def get_headers(response):
+    return dict((name, response.headers[name]) for name in RESPONSE_HEADERS
+                if name in response.headers)
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """
+    Answers the requests of the clients of a CacheProxy.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        proxy = self.server.proxy
+        try:
+            status, headers, body = proxy.get(self.path, self.headers)
+        except (requests.RequestException, IOError, OSError) as exception:
+            logger.error('Error requesting %s: %s', self.path, exception)
+            status, headers, body = 502, {}, Body(b'')
+        url = 'http://{host}'.format(host=self.headers.get('Host'))
+        if 'json' in headers.get('Content-Type', ''):
+            # Point the URLs in the JSON documents to the proxy; PyGithub
+            # refuses to follow URLs of another host than its base URL.
+            try:
+                content = body.read()
+            finally:
+                body.close()
+            body = Body(content.replace(proxy.base_url.encode('utf-8'), url.encode('utf-8')))
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                if name == 'Link':
+                    value = value.replace(proxy.base_url, url)
+                self.send_header(name, value)
+            if isinstance(body, Body):
+                self.send_header('Content-Length', str(len(body.content)))
+                self.end_headers()
+                self.wfile.write(body.content)
+            else:
+                self.send_header('Content-Length', str(os.fstat(body.fileno()).st_size -
+                                                       body.tell()))
+                self.end_headers()
+                shutil.copyfileobj(body, self.wfile)
+        finally:
+            body.close()
+
+    def log_message(self, format, *args):
+        logger.debug('%s - %s', self.address_string(), format % args)
+
+
+class ProxyServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server answering each client of a CacheProxy in its own thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, proxy):
+        HTTPServer.__init__(self, address, ProxyHandler)
+        self.proxy = proxy
@@ -22,16 +22,59 @@
 
 import argparse
 import base64
+import collections
+import json
 import os
 import logging
 import errno
+import random
+import requests
 import urllib3
 import sys
+import threading
 import time
 
+from github import Auth
 from github import Github
+from github.Consts import DEFAULT_BASE_URL
 from github import GithubException
+from archiver import FORMATS
+from authenticator import DEFAULT_CACHE_DIR
+from authenticator import InstallationTokenAuth
+from archiver import open_archive
+from cache import DEFAULT_MAX_BYTES
+from cache import TreeCache
+from cloner import clone_directory
+from cloner import get_git_environment
 from configurer import configure_logging_console
+from configurer import configure_logging_queue
+from configurer import redirect_logging_console
+from downloader import DEFAULT_MAX_INFLIGHT_BYTES
+from downloader import DEFAULT_WORKERS
+from downloader import Pipeline
+from exceptions import IncompleteListingException
+from hedger import DEFAULT_MAX_SHARE
+from hedger import Hedger
+from lister import CountingRepository
+from lister import find_entry
+from lister import list_tree
+from mirror import Mirror
+from proxy import DEFAULT_PROXY_MAX_BYTES
+from proxy import CacheProxy
+from proxy import ProxyServer
+from releaser import DEFAULT_SEGMENT_SIZE
+from releaser import DEFAULT_SEGMENTS
+from releaser import download_release
+from reporter import ProgressReporter
+from reporter import format_size
+from verifier import git_blob_sha
+from verifier import list_files
+from verifier import verify_tree
+from writer import EXECUTABLE
+from writer import SYMLINK
+from writer import TreeWriter
+from writer import makedirs
+from writer import write_file
 
 # Logger instance for pygithubctl.
 format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -53,46 +96,215 @@ def download_file(repository, sha, source, target):
     logger.info('Fetching %s from %s', source, repository)
     try:
         contents = repository.get_contents(source, ref=sha)
-        data = base64.b64decode(contents.content)
-        output = open(target, "w")
-        output.write(data)
-        output.close()
+        write_file(target, base64.b64decode(contents.content))
     except (GithubException, IOError) as exception:
         logger.error('Error downloading %s: %s', source, exception)
         raise GithubException("Failed to download the resource %s", source)
 
 
-def download_directory(repository, sha, source, target):
+def download_directory(repository, sha, source, target, incremental=False,
+                       workers=DEFAULT_WORKERS, max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES,
+                       entries=None, progress=False, fsync=False, hedger=None, cache=None,
+                       prune=False):
     """
     Downloads the files and directories recursively from Git hosted on remote
-    GitHub server to the local file system.
+    GitHub server to the local file system. When incremental is set, files whose
+    local Git blob hash already matches the remote one are left untouched. When
+    prune is set, the local files under the source which are no longer in the
+    listing are removed, so the target mirrors the directory.
+
+    The files are downloaded by a pipeline of concurrent network requests,
+    base64 decoding and disk writes; at most max_inflight_bytes of file content
+    is held in memory at any time. The directories are created once up front
+    and each file is written atomically with its executable bit or as a
+    symbolic link, according to its mode in the tree.
 
     :param repository: Git repository hosted on GitHub server
     :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
     :param source: Path of resources on Git repository hosted on GitHub server.
     :param target: Path of target file on the local filesystem or disk.
+    :param incremental: Skip the files which are already up to date.
+    :param workers: Number of concurrent network requests.
+    :param max_inflight_bytes: Budget of file content held in memory at once.
+    :param entries: Listing of the files from list_tree; listed when None.
+    :param progress: Report the aggregated progress instead of each file.
+    :param fsync: Flush the files and directories to the disk.
+    :param hedger: Hedger for the requests of the files, or None.
+    :param cache: TreeCache for the listing of the directory, or None.
+    :param prune: Remove the local files which are not in the listing.
     :returns: None
     :raises: GithubException: If there is any failure during download.
     """
-    try:
-        contents = repository.get_dir_contents(source, ref=sha)
+    reporter = None
+    writer = TreeWriter(target, fsync)
+
+    def outdated(contents):
         for content in contents:
-            logger.info("Downloading %s", content.path)
-            if content.type == 'dir':
-                download_directory(repository, sha, content.path, target)
+            if incremental and is_up_to_date(os.path.join(target, content.path), content.sha):
+                logger.debug("Skipping %s; already up to date", content.path)
+                if reporter:
+                    reporter.skip(content.size)
             else:
-                path = content.path
-                contents = repository.get_contents(path, ref=sha)
-                data = base64.b64decode(contents.content)
-                destination = os.path.join(target, path)
-                logger.debug("Destination Path: %s", destination)
-                makedirs(os.path.join(target, os.path.dirname(path)))
-                output = open(destination, "w")
-                output.write(data)
-                output.close()
-    except (GithubException, IOError) as exception:
-        logger.error('Error downloading %s: %s', content.path, exception)
+                yield content
+
+    def write(content, data):
+        logger.debug("Destination Path: %s", os.path.join(target, content.path))
+        writer.write(content, data)
+        if reporter:
+            reporter.update(len(data))
+
+    pipeline = Pipeline(get_blob(repository, progress, hedger), decode_blob, write, workers,
+                        max_inflight_bytes)
+    try:
+        if entries is None:
+            entries = list_tree(repository, sha, source, workers, cache)
+        if progress:
+            reporter = start_progress(repository, entries)
+        pending = list(outdated(entries))
+        writer.prepare(pending)
+        pipeline.run(pending)
+        writer.close()
+        if prune:
+            prune_files(target, source, entries)
+    except (GithubException, IOError, IncompleteListingException) as exception:
+        logger.error('Error downloading %s: %s', source, exception)
         raise GithubException("Failed to download the resource %s", source)
+    finally:
+        if reporter:
+            reporter.stop()
+
+
+def prune_files(target, source, entries):
+    """
+    Removes the local files under the source directory which are not in the
+    listing of the directory, along with the directories left empty.
+
+    :param target: Path of the destination directory of the download.
+    :param source: Path of the directory in the repository.
+    :param entries: Listing of the files from list_tree.
+    :returns: None
+    :raises: OSError: If a file cannot be removed.
+    """
+    listed = set(entry.path for entry in entries)
+    root = os.path.normpath(os.path.join(target, source.strip('/')))
+    for path in list_files(target, source):
+        if path in listed:
+            continue
+        logger.info("Removing %s; no longer in %s", path, source or '/')
+        os.remove(os.path.join(target, path))
+        parent = os.path.dirname(os.path.normpath(os.path.join(target, path)))
+        while parent != root and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+
+def start_progress(repository, entries):
+    """
+    Starts reporting the aggregated progress of downloading the entries. The
+    remaining rate limit is read from the headers of the latest response, so
+    reporting it costs no request.
+
+    :param repository: Git repository hosted on GitHub server
+    :param entries: Listing of the files to download.
+    :returns: ProgressReporter instance
+    :raises: None
+    """
+    requester = getattr(repository, 'requester', None)
+    rate_limit = (lambda: requester.rate_limiting[0]) if requester else None
+    reporter = ProgressReporter(len(entries), sum(entry.size or 0 for entry in entries),
+                                rate_limit)
+    return reporter.start()
+
+
+def get_blob(repository, progress=False, hedger=None):
+    """
+    Returns the network stage of the download pipeline for the repository. The
+    Git blob API is used instead of the contents API, since it is keyed by the
+    immutable blob sha and serves files larger than one megabyte as well.
+
+    :param repository: Git repository hosted on GitHub server
+    :param progress: Log each file at DEBUG level, since progress is reported.
+    :param hedger: Hedger for the requests, or None.
+    :returns: Function fetching the base64 encoded content of a ContentFile.
+    :raises: None
+    """
+    level = logging.DEBUG if progress else logging.INFO
+
+    def fetch(content):
+        logger.log(level, "Downloading %s", content.path)
+        if hedger:
+            return hedger.call(repository.get_git_blob, content.sha).content
+        return repository.get_git_blob(content.sha).content
+    return fetch
+
+
+def decode_blob(raw):
+    """
+    Decode stage of the download pipeline; decodes the base64 encoded content
+    returned by the Git blob API.
+
+    :param raw: Base64 encoded content of the blob.
+    :returns: Content of the blob as bytes.
+    :raises: None
+    """
+    return base64.b64decode(raw)
+
+
+def archive(repository, sha, source, type, target, output_format,
+            workers=DEFAULT_WORKERS, max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES,
+            progress=False, hedger=None, cache=None):
+    """
+    Streams a single file or the files of a directory from Git hosted on remote
+    GitHub server into a tar, tar.gz or zip archive, without writing the files
+    to the local file system. Entries keep the repository path, are ordered by
+    path and carry a fixed timestamp, so the archive of a commit is reproducible.
+    The files are downloaded concurrently but added to the archive in order.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param source: Path of resources on Git repository hosted on GitHub server.
+    :param type: Either file or directory.
+    :param target: Binary stream to write the archive to.
+    :param output_format: One of tar, tar.gz or zip.
+    :param workers: Number of concurrent network requests.
+    :param max_inflight_bytes: Budget of file content held in memory at once.
+    :param progress: Report the aggregated progress instead of each file.
+    :param hedger: Hedger for the requests of the files, or None.
+    :param cache: TreeCache for the listing of the directory, or None.
+    :returns: None
+    :raises: GithubException: If there is any failure while downloading the files.
+    :raises: ValueError: If no file exists with the path of a single file.
+    """
+    output = open_archive(target, output_format)
+    reporter = None
+
+    def write(content, data):
+        logger.debug("Archiving %s", content.path)
+        mode = getattr(content, 'mode', None)
+        if mode == SYMLINK:
+            output.add_link(content.path, data.decode('utf-8'))
+        else:
+            output.add(content.path, data, 0o755 if mode == EXECUTABLE else 0o644)
+        if reporter:
+            reporter.update(len(data))
+
+    try:
+        if type == 'file':
+            contents = [find_entry(repository, sha, source)]
+        else:
+            contents = list_tree(repository, sha, source, workers, cache)
+        if progress:
+            reporter = start_progress(repository, contents)
+        pipeline = Pipeline(get_blob(repository, progress, hedger), decode_blob, write,
+                            workers, max_inflight_bytes, ordered=True)
+        pipeline.run(contents)
+        output.close()
+    except (GithubException, IOError, IncompleteListingException) as exception:
+        logger.error('Error archiving %s: %s', source, exception)
+        raise GithubException("Failed to download the resource %s", source)
+    finally:
+        if reporter:
+            reporter.stop()
 
 
 def get_sha(repository, tag):
@@ -122,6 +334,42 @@ def get_sha(repository, tag):
     return matched_tags[0].commit.sha
 
 
+def get_ref(repository, tag):
+    """
+    Get the Git reference of a given branch or tag. Branches are looked up
+    first, the same way as get_sha does. The returned reference keeps the ETag
+    of the response, so it can be polled cheaply with reference.update(); a
+    conditional request answered with 304 does not count against the rate limit.
+
+    :param: repository: Git repository hosted on GitHub server.
+    :param: tag (str): Name of branch or tag name of the Git repository.
+    :returns: GitRef instance of the branch or tag.
+    :raises: ValueError: If no Tag or Branch exists with that name
+    """
+    for prefix in ('heads', 'tags'):
+        try:
+            return repository.get_git_ref('{prefix}/{tag}'.format(prefix=prefix, tag=tag))
+        except GithubException as exception:
+            if exception.status != 404:
+                raise
+    raise ValueError('No Tag or Branch exists with that name')
+
+
+def is_up_to_date(path, sha):
+    """
+    Checks whether the file on the local file system has the same content as
+    the Git blob identified by the given sha.
+
+    :param: path (str): Path of the file on the local filesystem or disk.
+    :param: sha (str): Git blob hash of the remote file.
+    :returns: True if the file exists and matches the blob, False otherwise.
+    :raises: None
+    """
+    if not os.path.lexists(path) or os.path.isdir(path):
+        return False
+    return git_blob_sha(path) == sha
+
+
 def resolve_target(source, target):
     """
     Resolve the target path with source value. If the target is a
@@ -141,24 +389,6 @@ def resolve_target(source, target):
         return target
 
 
-def makedirs(path):
-    """
-    Create a leaf directory and all intermediate ones. Ignores the error
-    if the give path (absolute path) exists on the local file system.
-
-    :param (str) path: None
-    :returns: None
-    :raises: None
-    """
-    try:
-        os.makedirs(path)
-    except OSError as err:
-        if err.errno == errno.EEXIST and os.path.isdir(path):
-            pass
-        else:
-            raise
-
-
 def get_options(args):
     """
     Get the command-line options for executing each commands.
@@ -176,44 +406,202 @@ def get_options(args):
         action="store_const", dest="logging_level", const=logging.CRITICAL)
     subparsers = parser.add_subparsers(dest='command')
     fetch = subparsers.add_parser('fetch', help='Fetch file or directory')
+    add_fetch_arguments(fetch)
     fetch.add_argument(
+        '--output-format', required=False, choices=FORMATS,
+        help='Stream the file(s) into a tar, tar.gz or zip archive; use - as destination for stdout')
+    fetch.add_argument(
+        '--plan', nargs='?', const='text', choices=('text', 'json'),
+        help='Print the files, size and API requests of the fetch without downloading')
+    fetch.add_argument(
+        '--mirror', required=False,
+        help='Path of a local bare mirror of the repository to read from first')
+    fetch.add_argument(
+        '--backend', choices=('api', 'git'), default='api',
+        help='Download a directory through the GitHub API or a partial Git clone')
+    fetch.add_argument(
+        '--git-url', required=False,
+        help='URL of the Git repository for --backend git; the clone URL by default')
+    watch = subparsers.add_parser(
+        'watch', help='Poll a branch or tag and fetch again whenever it changes')
+    add_fetch_arguments(watch)
+    watch.add_argument(
+        '--interval', type=float, default=60,
+        help='Number of seconds to wait between two polls')
+    watch.add_argument(
+        '--jitter', type=float, default=0,
+        help='Maximum number of random seconds added to each poll interval')
+    release = subparsers.add_parser(
+        'release', help='Download the assets of a release')
+    add_repository_arguments(release)
+    release.add_argument(
+        '--tag', required=True,
+        help='Name of the tag of the release')
+    release.add_argument(
+        '--asset', required=False, action='append', dest='assets',
+        help='Glob pattern of the asset names to download; may be repeated')
+    release.add_argument(
+        '--destination', required=True,
+        help='Destination directory path to download the asset(s)')
+    release.add_argument(
+        '--segments', type=int, default=DEFAULT_SEGMENTS,
+        help='Number of concurrent range requests per asset')
+    release.add_argument(
+        '--segment-size', type=str_to_size, default=DEFAULT_SEGMENT_SIZE,
+        help='Minimum size of a segment, e.g. 8M')
+    release.add_argument(
+        '--checksums', required=False,
+        help='Name of a sha256sum style checksum asset of the release')
+    verify = subparsers.add_parser(
+        'verify', help='Check that a local directory matches a directory of a branch or tag')
+    add_repository_arguments(verify)
+    verify.add_argument(
+        '--branch', required=False,
+        help='Name of branch; a pointer to a snapshot of your changes')
+    verify.add_argument(
+        '--tag', required=False,
+        help='Name of tag; a version of a particular branch at a moment in time')
+    verify.add_argument(
+        '--path', required=True,
+        help='A specific directory path in your repository to verify')
+    verify.add_argument(
+        '--destination', required=True,
+        help='Destination directory path the directory was downloaded to')
+    verify.add_argument(
+        '--processes', type=int, required=False,
+        help='Number of processes hashing the local files; the number of cores by default')
+    verify.add_argument(
+        '--tree-cache', action='store_true',
+        help='Cache the tree listings under --cache-dir, keyed by the commit sha')
+    verify.add_argument(
+        '--tree-cache-max-bytes', type=str_to_size, default=DEFAULT_MAX_BYTES,
+        help='Maximum size of the tree cache on the disk, e.g. 256M')
+    proxy = subparsers.add_parser(
+        'cache-proxy', help='Serve a pull-through cache of the GitHub API to a fleet of hosts')
+    proxy.add_argument(
         '--hostname', required=False,
         help='Hostname of your GitHub server')
-    fetch.add_argument(
-        '--auth-token', required=True,
+    proxy.add_argument(
+        "--http-ssl-verify", type=str_to_bool, nargs='?', const=True, default=True,
+        help='Boolean flag to enable or disable the SSL certificate verification')
+    proxy.add_argument(
+        '--cache-dir', required=False, default=DEFAULT_CACHE_DIR,
+        help='Directory of the caches of pygithubctl')
+    proxy.add_argument(
+        '--cache-max-bytes', type=str_to_size, default=DEFAULT_PROXY_MAX_BYTES,
+        help='Maximum size of the cache of the proxy on the disk, e.g. 4G')
+    proxy.add_argument(
+        '--bind', default='127.0.0.1',
+        help='Address to listen on; 0.0.0.0 for all the interfaces')
+    proxy.add_argument(
+        '--port', type=int, default=8080,
+        help='Port to listen on')
+    options = parser.parse_args(args)
+    return options
+
+
+def add_repository_arguments(parser):
+    """
+    Add the command-line options shared by the commands that connect to a Git
+    repository hosted on GitHub.
+
+    :param parser: ArgumentParser of the command.
+    :returns: None
+    :raises: None
+    """
+    parser.add_argument(
+        '--hostname', required=False,
+        help='Hostname of your GitHub server')
+    parser.add_argument(
+        '--auth-token', required=False,
         help='A personal access token to authenticate to GitHub')
-    fetch.add_argument(
+    parser.add_argument(
         '--owner', required=False,
         help='Owner of the Git repository hosted on GitHub')
-    fetch.add_argument(
+    parser.add_argument(
         '--username', required=False,
         help='Username to authenticate GitHub server')
-    fetch.add_argument(
+    parser.add_argument(
         '--password', required=False,
         help='Password to authenticate GitHub server')
-    fetch.add_argument(
+    parser.add_argument(
+        '--app-id', required=False,
+        help='ID of the GitHub App to authenticate as')
+    parser.add_argument(
+        '--private-key', required=False,
+        help='Path of the PEM encoded private key of the GitHub App')
+    parser.add_argument(
+        '--installation-id', required=False,
+        help='ID of the installation of the GitHub App')
+    parser.add_argument(
+        '--cache-dir', required=False, default=DEFAULT_CACHE_DIR,
+        help='Directory of the caches of pygithubctl')
+    parser.add_argument(
         '--repository', required=True,
         help='Name of GitHub repository')
-    fetch.add_argument(
+    parser.add_argument(
+        "--http-ssl-verify", type=str_to_bool, nargs='?', const=True, default=True,
+        help='Boolean flag to enable or disable the SSL certificate verification')
+    parser.add_argument(
+        '--pool-size', type=int, required=False,
+        help='Maximum number of HTTP connections kept open to the GitHub server')
+    parser.add_argument(
+        '--timeout', type=float, required=False,
+        help='Seconds to wait for the response of each request to the GitHub server')
+    parser.add_argument(
+        '--proxy-url', required=False,
+        help='URL of a pygithubctl cache-proxy to send the API requests through')
+
+
+def add_fetch_arguments(parser):
+    """
+    Add the command-line options shared by the commands that fetch a file or
+    directory from the Git repository.
+
+    :param parser: ArgumentParser of the command.
+    :returns: None
+    :raises: None
+    """
+    add_repository_arguments(parser)
+    parser.add_argument(
         '--branch', required=False,
         help='Name of branch; a pointer to a snapshot of your changes')
-    fetch.add_argument(
+    parser.add_argument(
         '--tag', required=False,
         help='Name of tag; a version of a particular branch at a moment in time')
-    fetch.add_argument(
+    parser.add_argument(
         '--path', required=True,
         help='A specific file or directory path in your repository to download')
-    fetch.add_argument(
+    parser.add_argument(
         '--type', required=True,
         help='Indicates the given path is a file or directory')
-    fetch.add_argument(
+    parser.add_argument(
         '--destination', required=True,
         help='Destination directory path to download the file(s)')
-    fetch.add_argument(
-        "--http-ssl-verify", type=str_to_bool, nargs='?', const=True, default=True,
-        help='Boolean flag to enable or disable the SSL certificate verification')
-    options = parser.parse_args(args)
-    return options
+    parser.add_argument(
+        '--workers', type=int, default=DEFAULT_WORKERS,
+        help='Number of files downloaded concurrently')
+    parser.add_argument(
+        '--max-inflight-bytes', type=str_to_size, default=DEFAULT_MAX_INFLIGHT_BYTES,
+        help='Maximum bytes of file content held in memory at once, e.g. 64M')
+    parser.add_argument(
+        '--progress', action='store_true',
+        help='Report the aggregated progress instead of each downloaded file')
+    parser.add_argument(
+        '--fsync', action='store_true',
+        help='Flush the downloaded files and directories to the disk')
+    parser.add_argument(
+        '--hedge', type=float, required=False,
+        help='Duplicate file requests slower than this percentile of the run, e.g. 95')
+    parser.add_argument(
+        '--hedge-max-share', type=float, default=DEFAULT_MAX_SHARE,
+        help='Maximum share of the file requests which may be duplicated')
+    parser.add_argument(
+        '--tree-cache', action='store_true',
+        help='Cache the tree listings under --cache-dir, keyed by the commit sha')
+    parser.add_argument(
+        '--tree-cache-max-bytes', type=str_to_size, default=DEFAULT_MAX_BYTES,
+        help='Maximum size of the tree cache on the disk, e.g. 256M')
 
 
 def str_to_bool(value):
@@ -236,6 +624,29 @@ def str_to_bool(value):
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
+def str_to_size(value):
+    """
+    Convert the string representation of a size to the number of bytes. The
+    value may carry a K, M or G suffix for kibibytes, mebibytes or gibibytes.
+
+    :param str value: string representation of a size, e.g. 512K or 64M
+    :returns: Number of bytes.
+    :raises: ArgumentTypeError when the value is not a size
+    """
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    value = str(value).strip().upper().rstrip('B')
+    multiplier = units.get(value[-1:], 1)
+    if value[-1:] in units:
+        value = value[:-1]
+    try:
+        size = int(float(value) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError('Size value expected, e.g. 64M')
+    if size <= 0:
+        raise argparse.ArgumentTypeError('Size must be positive')
+    return size
+
+
 def get_branch_or_tag(options):
     """
     Get the value of branch or tag from the given list of options. If the
@@ -271,34 +682,215 @@ def get_base_url(hostname):
     return hostname
 
 
+def get_app_auth(options):
+    """
+    Constructs the authentication of a GitHub App installation from the
+    options, or returns None if no GitHub App is given.
+
+    :param options: Options to be used to establish the connection.
+    :returns: InstallationTokenAuth instance or None
+    :raises: GithubException: If the GitHub App options are incomplete.
+    """
+    if not options.app_id:
+        return None
+    if not (options.private_key and options.installation_id):
+        raise GithubException("--app-id requires --private-key and --installation-id")
+    with open(options.private_key) as stream:
+        private_key = stream.read()
+    base_url = get_base_url(options.hostname) if options.hostname else DEFAULT_BASE_URL
+    return InstallationTokenAuth(base_url, options.app_id, private_key, options.installation_id,
+                                 options.http_ssl_verify, options.cache_dir)
+
+
 def get_github(options):
     """
-    Constructs the GitHub instance for fetch operation.
+    Constructs the GitHub instance for fetch operation. A GitHub App takes
+    precedence over a personal access token, which in turn takes precedence
+    over the username and password.
 
     :param options: Options to be used to establish the connection.
     :returns: Github instance
     :raises: GithubException
     """
-    if options.hostname and options.auth_token:
-        base_url = get_base_url(options.hostname)
-        return Github(base_url=base_url, login_or_token=options.auth_token,
-                      verify=options.http_ssl_verify)
-    elif options.hostname and options.username and options.password:
-        base_url = get_base_url(options.hostname)
-        return Github(base_url=base_url, login_or_token=options.username,
-                      password=options.password, verify=options.http_ssl_verify)
-    elif not options.hostname and options.auth_token:
-        return Github(options.auth_token)
-    elif not options.hostname and options.username and options.password:
-        return Github(options.username, options.password)
+    settings = {'verify': options.http_ssl_verify}
+    if options.hostname:
+        settings['base_url'] = get_base_url(options.hostname)
+    if options.pool_size:
+        settings['pool_size'] = options.pool_size
+    if options.timeout:
+        settings['timeout'] = options.timeout
+    if options.proxy_url:
+        settings['base_url'] = options.proxy_url.rstrip('/')
+
+    auth = get_app_auth(options)
+    if auth:
+        return Github(auth=auth, **settings)
+    elif options.auth_token:
+        return Github(auth=Auth.Token(options.auth_token), **settings)
+    elif options.username and options.password:
+        return Github(auth=Auth.Login(options.username, options.password), **settings)
     else:
         raise GithubException("Unable to authenticate GitHub server!")
 
 
+def get_repository(github, options):
+    """
+    Get the Git repository to fetch from. On an enterprise GitHub server the
+    repository is looked up in the first organization of the authenticated
+    user, otherwise the owner is taken from the options.
+
+    :param github: Github instance returned by get_github.
+    :param map options: Options supplied from command-line.
+    :returns: Repository instance
+    :raises: GithubException
+    """
+    if options.hostname:
+        organizations = github.get_user().get_orgs()
+        logger.debug('github.get_user(): %s', github.get_user())
+        logger.debug('organizations.totalCount: %s', organizations.totalCount)
+        organization = organizations[0]
+        logger.debug('organization: %s', organization)
+        return organization.get_repo(options.repository)
+    return github.get_repo("{owner}/{repository}".format(
+        owner=options.owner, repository=options.repository))
+
+
+def download(repository, sha, options, incremental=False, prune=False):
+    """
+    Download the file or directory given by --path and --type at the given
+    commit to the destination.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param map options: Options supplied from command-line to fetch the file/dir.
+    :param incremental: Skip the files which are already up to date.
+    :param prune: Remove the local files of a directory which are no longer in it.
+    :returns: None
+    :raises: ValueError
+    """
+    if getattr(options, 'output_format', None):
+        download_archive(repository, sha, options)
+    elif options.type.lower() in ('f', 'file'):
+        destination = resolve_target(options.path, options.destination)
+        logger.debug('destination: %s', destination)
+        download_file(repository, sha, options.path, destination)
+    elif options.type.lower() in ('d', 'dir', 'directory'):
+        destination = options.destination
+        logger.debug('destination: %s', destination)
+        download_directory(repository, sha, options.path, destination, incremental,
+                           options.workers, options.max_inflight_bytes,
+                           progress=options.progress, fsync=options.fsync,
+                           hedger=get_hedger(options), cache=get_tree_cache(options),
+                           prune=prune)
+    else:
+        raise ValueError('Value of --type should be either file or directory')
+
+
+def get_hedger(options):
+    """
+    Constructs the Hedger for the requests of the files from the options, or
+    returns None if hedging is not enabled.
+
+    :param map options: Options supplied from command-line to fetch the file/dir.
+    :returns: Hedger instance or None
+    :raises: None
+    """
+    if not options.hedge:
+        return None
+    return Hedger(options.hedge, options.hedge_max_share)
+
+
+def get_tree_cache(options):
+    """
+    Constructs the TreeCache for the tree listings under --cache-dir from the
+    options, or returns None if the cache is not enabled.
+
+    :param map options: Options supplied from command-line to fetch the file/dir.
+    :returns: TreeCache instance or None
+    :raises: None
+    """
+    if not options.tree_cache:
+        return None
+    return TreeCache(os.path.join(options.cache_dir, 'trees'), options.tree_cache_max_bytes)
+
+
+def download_archive(repository, sha, options):
+    """
+    Download the file or directory given by --path and --type at the given
+    commit as an archive of --output-format. The archive is written to stdout
+    when the destination is '-', otherwise to the destination file.
+
+    :param repository: Git repository hosted on GitHub server
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param map options: Options supplied from command-line to fetch the file/dir.
+    :returns: None
+    :raises: ValueError
+    """
+    if options.type.lower() in ('f', 'file'):
+        type = 'file'
+    elif options.type.lower() in ('d', 'dir', 'directory'):
+        type = 'directory'
+    else:
+        raise ValueError('Value of --type should be either file or directory')
+
+    if options.destination == '-':
+        stream = getattr(sys.stdout, 'buffer', sys.stdout)
+        archive(repository, sha, options.path, type, stream, options.output_format,
+                options.workers, options.max_inflight_bytes, options.progress,
+                get_hedger(options), get_tree_cache(options))
+        stream.flush()
+    else:
+        with open(options.destination, 'wb') as stream:
+            archive(repository, sha, options.path, type, stream, options.output_format,
+                    options.workers, options.max_inflight_bytes, options.progress,
+                    get_hedger(options), get_tree_cache(options))
+
+
+def get_session(options):
+    """
+    Constructs a requests session authenticated the same way as the Github
+    instance, for the downloads which are not API calls.
+
+    :param options: Options to be used to establish the connection.
+    :returns: requests.Session instance
+    :raises: GithubException
+    """
+    session = requests.Session()
+    session.verify = options.http_ssl_verify
+    username, password = get_credentials(options)
+    if username == 'x-access-token':
+        session.headers['Authorization'] = 'token {token}'.format(token=password)
+    else:
+        session.auth = (username, password)
+    return session
+
+
+def get_credentials(options):
+    """
+    Get the credentials for the requests which do not go through the Github
+    instance, as a username and password pair; tokens are paired with the
+    username x-access-token, the way GitHub accepts them over Git HTTPS.
+
+    :param options: Options to be used to establish the connection.
+    :returns: Tuple of the username and the password or token.
+    :raises: GithubException
+    """
+    auth = get_app_auth(options)
+    if auth:
+        return 'x-access-token', auth.token
+    elif options.auth_token:
+        return 'x-access-token', options.auth_token
+    elif options.username and options.password:
+        return options.username, options.password
+    raise GithubException("Unable to authenticate GitHub server!")
+
+
 def fetch(options):
     """
     Fetch a specific file, folder or directory from a remote Git repository
-    hosted on GitHub.
+    hosted on GitHub. With --mirror, the ref and the objects are read from a
+    local bare mirror of the repository, and the GitHub API is only used for
+    the ref or the objects missing from the mirror.
 
     :param map options: Options supplied from command-line to fetch the file/dir.
     :returns: None
@@ -312,36 +904,386 @@ def fetch(options):
     logger.debug('http_ssl_verify: %s', options.http_ssl_verify)
     logger.debug('type: %s', options.type)
 
-    github = None
-    repository = None
+    if options.destination == '-' or options.plan:
+        redirect_logging_console(logger, sys.stderr)
 
-    github = get_github(options)
+    if options.mirror and options.backend == 'git':
+        raise ValueError('--mirror cannot be combined with --backend git')
 
-    if options.hostname:
-        organizations = github.get_user().get_orgs()
-        logger.debug('github.get_user(): %s', github.get_user())
-        logger.debug('organizations.totalCount: %s', organizations.totalCount)
-        organization = organizations[0]
-        logger.debug('organization: %s', organization)
-        repository = organization.get_repo(options.repository)
-    else:
-        repository = github.get_repo("{owner}/{repository}".format(
-            owner=options.owner, repository=options.repository))
+    if options.mirror:
+        mirror = Mirror(options.mirror, lambda: get_repository(get_github(options), options))
+        try:
+            sha = mirror.resolve(branch_or_tag)
+            if sha:
+                logger.debug('sha or hash from mirror: %s', sha)
+                if options.plan:
+                    return print_plan(plan(mirror, sha, options, 'mirror'), options.plan)
+                return download(mirror, sha, options)
+            logger.info('%s not found in mirror %s; using the API', branch_or_tag, options.mirror)
+        finally:
+            mirror.close()
+
+    github = get_github(options)
+    repository = get_repository(github, options)
 
     sha = get_sha(repository, branch_or_tag)
     logger.debug('sha or hash: %s', sha)
 
+    if options.backend == 'git':
+        if options.type.lower() not in ('d', 'dir', 'directory') or options.output_format:
+            raise ValueError('--backend git fetches directories to a destination directory only')
+        if options.plan:
+            return print_plan(plan(repository, sha, options, 'git', github), options.plan)
+        url = options.git_url or repository.clone_url
+        logger.info('Cloning %s of %s at %s', options.path, url, sha)
+        environment = get_git_environment(':'.join(get_credentials(options)),
+                                          options.http_ssl_verify)
+        return clone_directory(url, sha, options.path, options.destination, environment)
+
+    if options.plan:
+        return print_plan(plan(repository, sha, options, 'api', github), options.plan)
+    download(repository, sha, options)
+
+
+def plan(repository, sha, options, engine, github=None):
+    """
+    Plans the fetch of the file or directory given by --path and --type at the
+    given commit without downloading any content: lists the files with as few
+    requests as possible and estimates the API requests the download would
+    take with the chosen engine, one per file for the API and none for a mirror
+    or the Git protocol. The planning requests are the API requests of the
+    listing, including those a mirror passes on to the API.
+
+    :param repository: Git repository hosted on GitHub server, or a Mirror.
+    :param sha: unique ID (a.k.a. the "SHA" or "hash") against the commit
+    :param map options: Options supplied from command-line to fetch the file/dir.
+    :param engine: Name of the engine the download would use; api, mirror or git.
+    :param github: Github instance to read the rate limit from, or None.
+    :returns: map of the plan
+    :raises: ValueError
+    """
+    # A mirror counts the requests it passes on to the API itself.
+    counter = repository if isinstance(repository, Mirror) else CountingRepository(repository)
+    before = counter.requests
     if options.type.lower() in ('f', 'file'):
-        destination = resolve_target(options.path, options.destination)
-        logger.debug('destination: %s', destination)
-        download_file(repository, sha, options.path, destination)
+        entries = [find_entry(counter, sha, options.path)]
     elif options.type.lower() in ('d', 'dir', 'directory'):
-        destination = options.destination
-        logger.debug('destination: %s', destination)
-        download_directory(repository, sha, options.path, destination)
+        entries = list_tree(counter, sha, options.path, options.workers,
+                            get_tree_cache(options))
     else:
         raise ValueError('Value of --type should be either file or directory')
 
+    requests = len(entries) if engine == 'api' else 0
+    planning = counter.requests - before
+    result = {
+        'repository': options.repository,
+        'ref': get_branch_or_tag(options),
+        'sha': sha,
+        'path': options.path,
+        'files': len(entries),
+        'bytes': sum(entry.size or 0 for entry in entries),
+        'engine': engine,
+        'requests': {'planning': planning, 'download': requests},
+        'rate_limit': None,
+    }
+    if github:
+        remaining, limit = github.rate_limiting
+        result['rate_limit'] = {'remaining': remaining, 'limit': limit,
+                                'sufficient': remaining >= planning + requests}
+    return result
+
+
+def print_plan(result, output_format):
+    """
+    Prints the plan of a fetch to stdout, as text or JSON.
+
+    :param result: map of the plan returned by plan.
+    :param output_format: Either text or json.
+    :returns: None
+    :raises: None
+    """
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(result, indent=2, sort_keys=True) + '\n')
+        return
+    lines = [
+        'Repository: {repository}'.format(**result),
+        'Ref: {ref} ({sha})'.format(**result),
+        'Path: {path}'.format(**result),
+        'Files: {files}'.format(**result),
+        'Total size: {size}'.format(size=format_size(result['bytes'])),
+        'Engine: {engine}'.format(**result),
+        'API requests for planning: {planning}'.format(**result['requests']),
+        'API requests for download: {download}'.format(**result['requests']),
+    ]
+    if result['rate_limit']:
+        lines.append('Rate limit remaining: {remaining}/{limit}'.format(**result['rate_limit']))
+        if not result['rate_limit']['sufficient']:
+            lines.append('Warning: the download exceeds the remaining rate limit')
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def watch(options, polls=None):
+    """
+    Watch a branch or tag and fetch the file or directory again whenever it
+    moves to another commit. The reference is polled with conditional requests,
+    which are free of rate limit cost while nothing changes; the sha is only
+    resolved again through get_sha after a change. Directories are updated
+    incrementally, so only the changed files are downloaded again, and the
+    files removed from the directory are removed from the destination. A
+    failed poll or sync is logged and retried on the next poll.
+
+    :param map options: Options supplied from command-line to watch the file/dir.
+    :param polls: Number of polls before returning; None to watch forever.
+    :returns: None
+    :raises: ValueError
+    """
+    branch_or_tag = get_branch_or_tag(options)
+    github = get_github(options)
+    repository = get_repository(github, options)
+    reference = get_ref(repository, branch_or_tag)
+
+    sha = None
+    # Set until a change of the reference has been synced, since the next
+    # conditional poll no longer reports it.
+    changed = True
+    while True:
+        try:
+            if changed or reference.update():
+                changed = True
+                current = get_sha(repository, branch_or_tag)
+                if current != sha:
+                    logger.info('%s is at %s; updating %s', branch_or_tag, current,
+                                options.destination)
+                    download(repository, current, options, incremental=True, prune=True)
+                    sha = current
+                changed = False
+        except (GithubException, requests.RequestException, IOError) as exception:
+            logger.error('Error syncing %s: %s; retrying on the next poll', branch_or_tag,
+                         exception)
+        if polls is not None:
+            polls -= 1
+            if polls <= 0:
+                return
+        time.sleep(options.interval + random.uniform(0, options.jitter))
+
+
+def release(options):
+    """
+    Download the assets of a release, selected by glob patterns, from a remote
+    Git repository hosted on GitHub.
+
+    :param map options: Options supplied from command-line to download the assets.
+    :returns: None
+    :raises: ValueError: If no asset matches the patterns.
+    """
+    github = get_github(options)
+    repository = get_repository(github, options)
+    makedirs(options.destination)
+    download_release(repository, options.tag, options.assets or ['*'], options.destination,
+                     get_session(options), options.segments, options.segment_size,
+                     options.checksums)
+
+
+def verify(options):
+    """
+    Verify that the files under the destination exactly match the directory
+    given by --path at the branch or tag, by comparing the Git blob hashes of
+    the local files with the listing of the directory; no file content is
+    downloaded. The missing, extra and modified files are reported.
+
+    :param map options: Options supplied from command-line to verify the directory.
+    :returns: map of the sorted paths of the missing, extra and modified files.
+    :raises: IncompleteListingException: If the listing cannot be completed.
+    """
+    github = get_github(options)
+    repository = get_repository(github, options)
+    sha = get_sha(repository, get_branch_or_tag(options))
+    logger.debug('sha or hash: %s', sha)
+    entries = list_tree(repository, sha, options.path, cache=get_tree_cache(options))
+    result = verify_tree(entries, options.destination, options.path, options.processes)
+    for status in ('missing', 'extra', 'modified'):
+        for path in result[status]:
+            logger.error('%s: %s', status.capitalize(), path)
+    logger.info('Verified %d files: %d missing, %d extra, %d modified', len(entries),
+                len(result['missing']), len(result['extra']), len(result['modified']))
+    return result
+
+
+def cache_proxy(options):
+    """
+    Serve a pull-through cache of the GitHub API, which the fetches of a
+    fleet of hosts are routed through with --proxy-url, until interrupted.
+
+    :param map options: Options supplied from command-line to serve the cache.
+    :returns: None
+    :raises: None
+    """
+    base_url = get_base_url(options.hostname) if options.hostname else DEFAULT_BASE_URL
+    proxy = CacheProxy(base_url, os.path.join(options.cache_dir, 'proxy'),
+                       options.cache_max_bytes, options.http_ssl_verify)
+    server = ProxyServer((options.bind, options.port), proxy)
+    logger.info('Serving a cache of %s on http://%s:%d', base_url, options.bind, options.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class Client(object):
+    """
+    Client for using pygithubctl from Python instead of the command-line. A
+    client is constructed once and reused for many fetches: it keeps a single
+    Github instance, so the HTTP connections are reused, and caches the
+    resolved repositories, the commit sha of each branch or tag for ref_ttl
+    seconds and the tree listings, which never change for a given commit.
+
+    Example::
+
+        client = Client(auth_token='<valid-token>', owner='sarathkumarsivan')
+        client.fetch_directory('pygithubctl', 'docs', '/tmp', ref='master')
+        client.fetch_file('pygithubctl', 'README.rst', '/tmp', ref='master')
+    """
+
+    def __init__(self, hostname=None, auth_token=None, username=None, password=None,
+                 owner=None, http_ssl_verify=True, pool_size=None, workers=DEFAULT_WORKERS,
+                 max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES, ref_ttl=60, max_trees=128,
+                 app_id=None, private_key=None, installation_id=None,
+                 cache_dir=DEFAULT_CACHE_DIR, timeout=None, hedge=None,
+                 hedge_max_share=DEFAULT_MAX_SHARE, proxy_url=None):
+        """
+        :param hostname: Hostname of your GitHub server; None for github.com.
+        :param auth_token: A personal access token to authenticate to GitHub.
+        :param username: Username to authenticate GitHub server.
+        :param password: Password to authenticate GitHub server.
+        :param owner: Owner of the Git repositories hosted on github.com.
+        :param http_ssl_verify: Enable or disable the SSL certificate verification.
+        :param pool_size: Maximum number of HTTP connections kept open.
+        :param workers: Number of files downloaded concurrently.
+        :param max_inflight_bytes: Budget of file content held in memory at once.
+        :param ref_ttl: Seconds a resolved branch or tag is cached; 0 to disable.
+        :param max_trees: Maximum number of tree listings kept in memory.
+        :param app_id: ID of the GitHub App to authenticate as.
+        :param private_key: Path of the PEM encoded private key of the GitHub App.
+        :param installation_id: ID of the installation of the GitHub App.
+        :param cache_dir: Directory of the caches of pygithubctl.
+        :param timeout: Seconds to wait for the response of each request.
+        :param hedge: Percentile of the latencies after which a file request is
+                      duplicated; None to disable hedging.
+        :param hedge_max_share: Maximum share of the file requests duplicated.
+        :param proxy_url: URL of a cache-proxy to send the API requests through.
+        :raises: GithubException: If no credentials are given.
+        """
+        self.options = argparse.Namespace(
+            hostname=hostname, auth_token=auth_token, username=username, password=password,
+            owner=owner, http_ssl_verify=http_ssl_verify, pool_size=pool_size, app_id=app_id,
+            private_key=private_key, installation_id=installation_id, cache_dir=cache_dir,
+            timeout=timeout, hedge=hedge, hedge_max_share=hedge_max_share,
+            proxy_url=proxy_url)
+        self.workers = workers
+        self.max_inflight_bytes = max_inflight_bytes
+        self.ref_ttl = ref_ttl
+        self.max_trees = max_trees
+        self.github = get_github(self.options)
+        self.hedger = get_hedger(self.options)
+        self.repositories = {}
+        self.refs = {}
+        self.trees = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_repository(self, name):
+        """
+        Get the Git repository with the given name; resolved once per client.
+
+        :param name: Name of GitHub repository.
+        :returns: Repository instance
+        :raises: GithubException
+        """
+        with self.lock:
+            if name not in self.repositories:
+                options = argparse.Namespace(repository=name, **vars(self.options))
+                self.repositories[name] = get_repository(self.github, options)
+            return self.repositories[name]
+
+    def resolve_ref(self, repository, ref='master'):
+        """
+        Get the commit sha of a branch or tag. A full commit sha is returned as
+        such, without any request.
+
+        :param repository: Name of GitHub repository.
+        :param ref: Name of branch or tag, or a commit sha.
+        :returns: sha (str): Commit sha of the branch or tag.
+        :raises: ValueError: If no Tag or Branch exists with that name
+        """
+        if len(ref) == 40 and all(char in '0123456789abcdef' for char in ref):
+            return ref
+        key = (repository, ref)
+        with self.lock:
+            cached = self.refs.get(key)
+        if cached and time.time() - cached[1] < self.ref_ttl:
+            return cached[0]
+        sha = get_sha(self.get_repository(repository), ref)
+        with self.lock:
+            self.refs[key] = (sha, time.time())
+        return sha
+
+    def list_directory(self, repository, path, ref='master'):
+        """
+        List the files under a directory of the repository recursively.
+
+        :param repository: Name of GitHub repository.
+        :param path: Path of the directory in the repository.
+        :param ref: Name of branch or tag, or a commit sha.
+        :returns: List of TreeEntry instances of the files.
+        :raises: IncompleteListingException: If the listing cannot be completed.
+        """
+        key = (repository, self.resolve_ref(repository, ref), path.strip('/'))
+        with self.lock:
+            if key in self.trees:
+                self.trees[key] = self.trees.pop(key)
+                return self.trees[key]
+        entries = list_tree(self.get_repository(repository), key[1], path, self.workers)
+        with self.lock:
+            self.trees[key] = entries
+            while len(self.trees) > self.max_trees:
+                self.trees.popitem(last=False)
+        return entries
+
+    def fetch_file(self, repository, path, destination, ref='master'):
+        """
+        Download a single file of the repository.
+
+        :param repository: Name of GitHub repository.
+        :param path: Path of the file in the repository.
+        :param destination: Path of the target file or directory.
+        :param ref: Name of branch or tag, or a commit sha.
+        :returns: Path of the downloaded file.
+        :raises: GithubException: If there is any failure while downloading the file.
+        """
+        sha = self.resolve_ref(repository, ref)
+        target = resolve_target(path, destination)
+        download_file(self.get_repository(repository), sha, path, target)
+        return target
+
+    def fetch_directory(self, repository, path, destination, ref='master', incremental=False):
+        """
+        Download the files under a directory of the repository recursively. The
+        files keep their repository path under the destination.
+
+        :param repository: Name of GitHub repository.
+        :param path: Path of the directory in the repository.
+        :param destination: Path of the target directory.
+        :param ref: Name of branch or tag, or a commit sha.
+        :param incremental: Skip the files which are already up to date.
+        :returns: None
+        :raises: GithubException: If there is any failure during download.
+        """
+        sha = self.resolve_ref(repository, ref)
+        download_directory(self.get_repository(repository), sha, path, destination,
+                           incremental, self.workers, self.max_inflight_bytes,
+                           self.list_directory(repository, path, sha), hedger=self.hedger)
+
 
 def main():
     """
@@ -357,9 +1299,20 @@ def main():
     start_time = time.time()  # assumes that task takes at least a tenth of second to run.
     options = get_options(sys.argv[1:])
     logger.setLevel(level=options.logging_level)
+    configure_logging_queue(logger)
 
     if options.command == 'fetch':
         fetch(options)
+    elif options.command == 'watch':
+        watch(options)
+    elif options.command == 'release':
+        release(options)
+    elif options.command == 'cache-proxy':
+        cache_proxy(options)
+    elif options.command == 'verify':
+        result = verify(options)
+        if any(result.values()):
+            sys.exit(1)
     else:
         raise ValueError('Unknown option %s', options.command)
     logger.info("Task completed in %s seconds" % (time.time() - start_time))
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import requests
+
+from multiprocessing.pool import ThreadPool
+from exceptions import ChecksumException
+from urllib.parse import urlparse
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default number of concurrent range requests per asset.
+DEFAULT_SEGMENTS = 4
+
+# Default minimum size of a segment; smaller assets use fewer segments.
+DEFAULT_SEGMENT_SIZE = 8 * 1024 * 1024
+
+# Size of the chunks read from the network and written to the disk.
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes downloaded by a segment between two saves of the resumption state.
+SAVE_INTERVAL = 16 * 1024 * 1024
+
+
+def match_assets(assets, patterns):
+    """
+    Selects the release assets whose name matches any of the glob patterns.
+
+    :param assets: Release assets of a GitHub release.
+    :param patterns: Glob patterns, e.g. ['*.tar.gz', 'SHA256SUMS'].
+    :returns: List of the matching assets.
+    :raises: None
+    """
+    return [asset for asset in assets
+            if any(fnmatch.fnmatchcase(asset.name, pattern) for pattern in patterns)]
+
+
+def split_ranges(size, segments, segment_size):
+    """
+    Splits the bytes of a file into contiguous ranges of about the same size;
+    no more than the given number of segments and none smaller than segment
+    size, except for a file smaller than a single segment.
+
+    :param size: Size of the file in bytes.
+    :param segments: Maximum number of ranges.
+    :param segment_size: Minimum size of a range in bytes.
+    :returns: List of [start, end] pairs with inclusive end offsets.
+    :raises: None
+    """
+    count = max(1, min(segments, size // max(1, segment_size)))
+    bounds = [size * index // count for index in range(count + 1)]
+    return [[bounds[index], bounds[index + 1] - 1] for index in range(count)
+            if bounds[index + 1] > bounds[index]]
+
+
+def get_storage_session(session):
+    """
+    Creates a session without the GitHub credentials for the storage server of
+    the assets; only the TLS verification and the proxies are carried over.
+
+    :param session: requests.Session authenticated to the GitHub server.
+    :returns: Unauthenticated requests.Session.
+    :raises: None
+    """
+    storage = requests.Session()
+    storage.verify = session.verify
+    storage.proxies.update(session.proxies)
+    return storage
+
+
+def resolve_location(session, url):
+    """
+    Resolves the URL an asset is actually served from. GitHub answers the asset
+    API with a redirect to a pre-signed storage URL, which must be requested
+    without the GitHub credentials, neither the token header nor the basic
+    authentication of the session; the range requests go there directly
+    instead of being redirected one by one.
+
+    :param session: requests.Session authenticated to the GitHub server.
+    :param url: API URL of the release asset.
+    :returns: Tuple of the session, the URL and the headers for the range requests.
+    :raises: requests.HTTPError: If the asset cannot be requested.
+    """
+    headers = {'Accept': 'application/octet-stream'}
+    response = session.get(url, headers=headers, allow_redirects=False, stream=True)
+    response.close()
+    if response.is_redirect:
+        location = response.headers['Location']
+        if urlparse(location).netloc != urlparse(url).netloc:
+            return get_storage_session(session), location, {}
+        return session, location, headers
+    response.raise_for_status()
+    return session, url, headers
+
+
+def load_state(path, asset):
+    """
+    Loads the resumption state of a partially downloaded asset. The state is
+    discarded if it belongs to another upload of the asset.
+    """
+    try:
+        with open(path) as stream:
+            state = json.load(stream)
+    except (IOError, ValueError):
+        return None
+    if state.get('id') != asset.id or state.get('size') != asset.size:
+        return None
+    return state
+
+
+def save_state(path, state):
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as stream:
+        json.dump(state, stream)
+    os.rename(temporary, path)
+
+
+def download_segment(session, url, headers, target, segment, progress):
+    """
+    Downloads one range of an asset into its place in the part file. The
+    segment is a [start, end, done] triple; done is the number of bytes of the
+    range already downloaded, and is advanced as the chunks are written.
+    """
+    start, end = segment[0] + segment[2], segment[1]
+    if start > end:
+        return
+    headers = dict(headers, Range='bytes=%d-%d' % (start, end))
+    response = session.get(url, headers=headers, stream=True)
+    try:
+        response.raise_for_status()
+        length = int(response.headers.get('Content-Length', -1))
+        if response.status_code != 206 and length != end - start + 1:
+            raise IOError('Server does not support range requests for %s' % url)
+        with open(target, 'r+b') as output:
+            output.seek(start)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                output.write(chunk)
+                progress(segment, len(chunk))
+        if segment[0] + segment[2] <= end:
+            raise IOError('Connection closed before the end of range %d-%d' % (start, end))
+    finally:
+        response.close()
+
+
+def download_asset(session, asset, destination, segments=DEFAULT_SEGMENTS,
+                   segment_size=DEFAULT_SEGMENT_SIZE, checksum=None):
+    """
+    Downloads a release asset with concurrent HTTP range requests, each writing
+    its segment into a preallocated part file. The progress of every segment
+    is saved next to the part file, so an interrupted download resumes where
+    it stopped. The part file is renamed to the asset name once it is complete
+    and its checksum has been verified.
+
+    :param session: requests.Session authenticated to the GitHub server.
+    :param asset: GitReleaseAsset to download.
+    :param destination: Destination directory of the asset.
+    :param segments: Maximum number of concurrent range requests.
+    :param segment_size: Minimum size of a segment in bytes.
+    :param checksum: Expected checksum as "sha256:<hex>"; None to skip.
+    :returns: Path of the downloaded asset.
+    :raises: ChecksumException: If the checksum of the asset does not match.
+    """
+    target = os.path.join(destination, asset.name)
+    part = target + '.part'
+    state_path = part + '.json'
+    state = load_state(state_path, asset) if os.path.isfile(part) else None
+    if state is None:
+        state = {'id': asset.id, 'size': asset.size,
+                 'segments': [bounds + [0] for bounds in split_ranges(asset.size, segments, segment_size)]}
+        with open(part, 'wb') as output:
+            output.truncate(asset.size)
+        save_state(state_path, state)
+    else:
+        logger.info('Resuming %s', asset.name)
+
+    lock = threading.Lock()
+    unsaved = [0]
+
+    def progress(segment, size):
+        with lock:
+            segment[2] += size
+            unsaved[0] += size
+            if unsaved[0] >= SAVE_INTERVAL:
+                unsaved[0] = 0
+                save_state(state_path, state)
+
+    logger.info('Downloading %s (%d bytes) in %d segments', asset.name, asset.size, len(state['segments']))
+    # An empty asset has no segment to request; its part file is complete.
+    if state['segments']:
+        source, url, headers = resolve_location(session, asset.url)
+        pool = ThreadPool(len(state['segments']))
+        try:
+            pool.map(lambda segment: download_segment(source, url, headers, part, segment, progress),
+                     state['segments'])
+        finally:
+            pool.close()
+            with lock:
+                save_state(state_path, state)
+
+    if checksum:
+        verify_checksum(part, checksum, asset.name)
+    os.rename(part, target)
+    os.remove(state_path)
+    return target
+
+
+def verify_checksum(path, checksum, name):
+    """
+    Verifies the checksum of a file; the part file is removed on a mismatch,
+    so the next attempt downloads the asset again from scratch.
+
+    :raises: ChecksumException: If the checksum does not match.
+    """
+    algorithm, _, expected = checksum.partition(':')
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    if digest.hexdigest() != expected.lower():
+        os.remove(path)
+        os.remove(path + '.json')
+        raise ChecksumException('Checksum mismatch for %s: expected %s, got %s:%s'
+                                % (name, checksum, algorithm, digest.hexdigest()))
+    logger.debug('Verified %s of %s', checksum, name)
+
+
+def parse_checksums(text):
+    """
+    Parses a checksum file in the format of sha256sum, i.e. one "<hex> <name>"
+    line per file, where the name may be prefixed with * for binary mode.
+
+    :param text: Content of the checksum file.
+    :returns: Map of file name to "sha256:<hex>".
+    :raises: None
+    """
+    checksums = {}
+    for line in text.splitlines():
+        fields = line.strip().split(None, 1)
+        if len(fields) == 2:
+            checksums[fields[1].lstrip('*')] = 'sha256:' + fields[0].lower()
+    return checksums
+
+
+def get_checksum(asset, checksums):
+    """
+    Gets the expected checksum of an asset; the one listed in the checksum
+    file of the release takes precedence over the digest reported by GitHub.
+    """
+    if asset.name in checksums:
+        return checksums[asset.name]
+    return getattr(asset, 'digest', None)
+
+
+def download_release(repository, tag, patterns, destination, session,
+                     segments=DEFAULT_SEGMENTS, segment_size=DEFAULT_SEGMENT_SIZE,
+                     checksums=None):
+    """
+    Downloads the assets of the release with the given tag whose name matches
+    any of the glob patterns.
+
+    :param repository: Git repository hosted on GitHub server
+    :param tag: Name of the tag of the release.
+    :param patterns: Glob patterns of the asset names to download.
+    :param destination: Destination directory of the assets.
+    :param session: requests.Session authenticated to the GitHub server.
+    :param segments: Maximum number of concurrent range requests per asset.
+    :param segment_size: Minimum size of a segment in bytes.
+    :param checksums: Name of a sha256sum style checksum asset of the release.
+    :returns: List of the paths of the downloaded assets.
+    :raises: ValueError: If no asset matches the patterns.
+    """
+    release = repository.get_release(tag)
+    assets = list(release.get_assets())
+    selected = match_assets(assets, patterns)
+    if not selected:
+        raise ValueError('No asset of release %s matches %s' % (tag, ', '.join(patterns)))
+
+    sums = {}
+    if checksums:
+        matched = [asset for asset in assets if asset.name == checksums]
+        if not matched:
+            raise ValueError('No asset of release %s is named %s' % (tag, checksums))
+        source, url, headers = resolve_location(session, matched[0].url)
+        response = source.get(url, headers=headers)
+        response.raise_for_status()
+        sums = parse_checksums(response.text)
+
+    return [download_asset(session, asset, destination, segments, segment_size,
+                           get_checksum(asset, sums))
+            for asset in selected]
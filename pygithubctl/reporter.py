@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import logging
+import threading
+import time
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Default number of seconds between two progress reports.
+DEFAULT_INTERVAL = 5
+
+
+def format_size(size):
+    if size < 1024:
+        return '%d B' % size
+    for unit in ('KB', 'MB', 'GB'):
+        size /= 1024.0
+        if size < 1024 or unit == 'GB':
+            return '%.1f %s' % (size, unit)
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return 'unknown'
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return '%dh%02dm' % (hours, minutes)
+    return '%dm%02ds' % (minutes, seconds) if minutes else '%ds' % seconds
+
+
+class ProgressReporter(object):
+    """
+    Aggregated progress of a download, logged at INFO level every interval
+    seconds from a background thread instead of one line per file: files and
+    bytes done, throughput, estimated time left and, when a rate_limit
+    function is given, the remaining GitHub rate limit.
+    """
+
+    def __init__(self, files, size, rate_limit=None, interval=DEFAULT_INTERVAL):
+        """
+        :param files: Number of files to download.
+        :param size: Total size of the files in bytes.
+        :param rate_limit: Function returning the remaining rate limit, or None.
+        :param interval: Seconds between two progress reports.
+        """
+        self.files = files
+        self.size = size
+        self.rate_limit = rate_limit
+        self.interval = interval
+        self.done_files = 0
+        self.done_size = 0
+        self.started = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def update(self, size):
+        """
+        Records a downloaded file of the given size.
+        """
+        with self.lock:
+            self.done_files += 1
+            self.done_size += size
+
+    def skip(self, size):
+        """
+        Removes a file of the given size which needs no download from the totals.
+        """
+        with self.lock:
+            self.files -= 1
+            self.size -= size
+
+    def start(self):
+        self.started = time.time()
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+        self.report()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.report()
+
+    def report(self):
+        logger.info(self.summary())
+
+    def summary(self):
+        with self.lock:
+            files, size = self.done_files, self.done_size
+            total_files, total_size = self.files, self.size
+        elapsed = max(time.time() - (self.started or time.time()), 1e-6)
+        rate = size / elapsed
+        eta = (total_size - size) / rate if rate else None
+        message = 'Downloaded %d/%d files, %s/%s (%.1f files/s, %s/s, ETA %s' % (
+            files, total_files, format_size(size), format_size(total_size),
+            files / elapsed, format_size(rate), format_duration(eta))
+        if self.rate_limit:
+            message += ', rate limit remaining %s' % self.rate_limit()
+        return message + ')'
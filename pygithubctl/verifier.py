@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import logging
+import multiprocessing
+import os
+
+# Logger instance for pygithubctl.
+logger = logging.getLogger('pygithubctl')
+
+# Number of files handed to a process of the pool at once.
+CHUNK_SIZE = 64
+
+
+def git_blob_sha(path):
+    """
+    Computes the Git blob hash of a file on the local file system; the SHA-1
+    of the "blob <size>" header followed by the content of the file, or of the
+    target of a symbolic link. The result is comparable with the sha of the
+    contents listed on GitHub.
+
+    :param: path (str): Path of the file on the local filesystem or disk.
+    :returns: sha (str): Hexadecimal Git blob hash of the file.
+    :raises: IOError: If the file cannot be read.
+    """
+    if os.path.islink(path):
+        target = os.readlink(path).encode('utf-8')
+        return hashlib.sha1(('blob %d\0' % len(target)).encode('ascii') + target).hexdigest()
+    digest = hashlib.sha1(('blob %d\0' % os.path.getsize(path)).encode('ascii'))
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_files(target, source):
+    """
+    Lists the files under a directory of the local file system recursively,
+    with their paths relative to the target, the way they are laid out by a
+    download of the directory. Symbolic links are listed as files and never
+    followed.
+
+    :param target: Path of the destination directory of the download.
+    :param source: Path of the directory in the repository.
+    :returns: List of the paths of the files.
+    """
+    prefix = '/'.join(name for name in source.split('/') if name)
+    files = []
+    for directory, names, filenames in os.walk(os.path.join(target, prefix)):
+        relative = os.path.relpath(directory, target).replace(os.sep, '/')
+        links = [name for name in names if os.path.islink(os.path.join(directory, name))]
+        for name in filenames + links:
+            files.append(name if relative == '.' else '/'.join((relative, name)))
+    return files
+
+
+def hash_files(target, paths, processes=None):
+    """
+    Computes the Git blob hashes of the files with a pool of processes, so the
+    hashing of a large tree uses all the cores.
+
+    :param target: Path of the directory the paths are relative to.
+    :param paths: Paths of the files.
+    :param processes: Number of processes; the number of cores when None.
+    :returns: map of the paths to their Git blob hashes.
+    :raises: IOError: If a file cannot be read.
+    """
+    if not paths:
+        return {}
+    pool = multiprocessing.Pool(processes)
+    try:
+        hashes = pool.map(git_blob_sha, [os.path.join(target, path) for path in paths],
+                          CHUNK_SIZE)
+    finally:
+        pool.close()
+        pool.join()
+    return dict(zip(paths, hashes))
+
+
+def verify_tree(entries, target, source, processes=None):
+    """
+    Compares the files under a directory of the local file system with the
+    listing of the directory in the repository, by their Git blob hashes, so
+    no content is downloaded.
+
+    :param entries: List of TreeEntry instances of the remote files.
+    :param target: Path of the destination directory of the download.
+    :param source: Path of the directory in the repository.
+    :param processes: Number of processes hashing the files.
+    :returns: map of the sorted paths of the missing, extra and modified files.
+    :raises: IOError: If a file cannot be read.
+    """
+    remote = dict((entry.path, entry.sha) for entry in entries)
+    local = hash_files(target, list_files(target, source), processes)
+    return {
+        'missing': sorted(path for path in remote if path not in local),
+        'extra': sorted(path for path in local if path not in remote),
+        'modified': sorted(path for path in remote
+                           if path in local and local[path] != remote[path]),
+    }
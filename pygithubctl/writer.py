@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import errno
+import os
+import threading
+
+# Git tree modes of executable files and symbolic links.
+EXECUTABLE = '100755'
+SYMLINK = '120000'
+
+
+def write_file(path, data, mode=None, fsync=False):
+    """
+    Writes the content of a Git blob to a file atomically: the content goes to
+    a temporary file next to it, which is then renamed over the file, so a
+    reader never sees a partially written file. Executable files get the
+    executable bits and symbolic links are created as such, the way git checks
+    them out; both honour the umask.
+
+    :param path: Path of the file on the local filesystem or disk.
+    :param data: Content of the blob as bytes; the link target for a symlink.
+    :param mode: Git tree mode of the file, e.g. 100644, 100755 or 120000.
+    :param fsync: Flush the content to the disk before the rename.
+    :returns: None
+    :raises: OSError: If the file cannot be written.
+    """
+    directory, name = os.path.split(path)
+    temporary = os.path.join(directory, '.{name}.{pid}.{thread}.tmp'.format(
+        name=name, pid=os.getpid(), thread=threading.current_thread().ident))
+    try:
+        if mode == SYMLINK:
+            os.symlink(data.decode('utf-8'), temporary)
+        else:
+            permissions = 0o777 if mode == EXECUTABLE else 0o666
+            descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, permissions)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(descriptor, view):]
+                if fsync:
+                    os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+        os.rename(temporary, path)
+    except OSError:
+        if os.path.lexists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def makedirs(path):
+    """
+    Create a leaf directory and all intermediate ones. Ignores the error
+    if the give path (absolute path) exists on the local file system.
+
+    :param (str) path: None
+    :returns: None
+    :raises: None
+    """
+    try:
+        os.makedirs(path)
+    except OSError as err:
+        if err.errno == errno.EEXIST and os.path.isdir(path):
+            pass
+        else:
+            raise
+
+
+class TreeWriter(object):
+    """
+    Writes the files of a tree listing under a destination directory. The
+    directory skeleton is created once from the listing before any file is
+    written, instead of checking the parent directory of every file, and each
+    file is written atomically with write_file. With fsync enabled, the content
+    of each file is flushed before its rename and every directory is flushed
+    once, when the writer is closed, instead of after each rename.
+    """
+
+    def __init__(self, target, fsync=False):
+        """
+        :param target: Path of target directory on the local filesystem or disk.
+        :param fsync: Flush the files and directories to the disk.
+        """
+        # Normalized, so the walk up from the files stops at the target even
+        # for a target like out/ or ./out.
+        self.target = os.path.normpath(target)
+        self.fsync = fsync
+        self.directories = set()
+
+    def prepare(self, entries):
+        """
+        Creates the target with its missing parents, then the directories of
+        all the entries, parents first.
+
+        :param entries: Tree entries to be written; paths relative to the target.
+        :returns: None
+        :raises: OSError: If a directory cannot be created.
+        """
+        makedirs(self.target)
+        directories = set([self.target])
+        for entry in entries:
+            parent = os.path.dirname(os.path.join(self.target, entry.path))
+            while parent not in directories:
+                directories.add(parent)
+                parent = os.path.dirname(parent)
+        for directory in sorted(directories - set([self.target])):
+            try:
+                os.mkdir(directory)
+            except OSError as err:
+                if err.errno != errno.EEXIST or not os.path.isdir(directory):
+                    raise
+        self.directories = directories
+
+    def write(self, entry, data):
+        """
+        Writes the content of a tree entry to its path under the target.
+
+        :param entry: Tree entry with path and mode attributes.
+        :param data: Content of the blob as bytes.
+        :returns: None
+        :raises: OSError: If the file cannot be written.
+        """
+        write_file(os.path.join(self.target, entry.path), data,
+                   getattr(entry, 'mode', None), self.fsync)
+
+    def close(self):
+        """
+        Flushes the directories to the disk when fsync is enabled.
+        """
+        if not self.fsync:
+            return
+        for directory in sorted(self.directories, reverse=True):
+            descriptor = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
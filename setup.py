@@ -38,11 +38,14 @@ setup(name='pygithubctl',
           'Intended Audience :: Developers',
           'License :: OSI Approved :: MIT License',
           'Natural Language :: English',
-          'Programming Language :: Python :: 2.7',
-          'Programming Language :: Python :: 3.4',
-          'Programming Language :: Python :: 3.5',
-          'Programming Language :: Python :: 3.6'
+          'Programming Language :: Python :: 3',
+          'Programming Language :: Python :: 3.7',
+          'Programming Language :: Python :: 3.8',
+          'Programming Language :: Python :: 3.9',
+          'Programming Language :: Python :: 3.10',
+          'Programming Language :: Python :: 3.11'
       ],
+      python_requires='>=3.7',
       keywords='pygithubctl githubctl',
       url='http://github.com/sarathkumarsivan/pygithubctl',
       author='Sarath Kumar Sivan',
@@ -50,7 +53,10 @@ setup(name='pygithubctl',
       license='MIT',
       packages=['pygithubctl'],
       install_requires=[
-          'PyGithub',
+          'PyGithub>=1.59',
+          'PyJWT',
+          'cryptography',
+          'requests',
       ],
       test_suite='nose.collector',
       tests_require=['nose', 'nose-cover3'],
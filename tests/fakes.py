@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import base64
+import hashlib
+
+from collections import namedtuple
+from github import GithubException
+
+Commit = namedtuple('Commit', ['sha', 'tree'])
+Tree = namedtuple('Tree', ['sha', 'tree', 'truncated'])
+Element = namedtuple('Element', ['path', 'mode', 'type', 'sha', 'size'])
+Blob = namedtuple('Blob', ['sha', 'size', 'content'])
+Content = namedtuple('Content', ['path', 'type', 'sha', 'size', 'content'])
+Branch = namedtuple('Branch', ['name', 'commit'])
+
+
+def blob_sha(data):
+    return hashlib.sha1(('blob %d\0' % len(data)).encode('ascii') + data).hexdigest()
+
+
+class FakeRepository(object):
+    """
+    In-memory repository answering the subset of the PyGithub Repository API
+    used by pygithubctl. Tree listings with more than max_entries entries are
+    truncated the same way GitHub does, and every call is counted.
+    """
+
+    def __init__(self, files, modes=None, max_entries=100000):
+        self.blobs = {}
+        self.trees = {}
+        self.calls = []
+        self.max_entries = max_entries
+        self.files = files
+        modes = modes or {}
+        root = {}
+        for path, data in files.items():
+            node = root
+            names = path.split('/')
+            for name in names[:-1]:
+                node = node.setdefault(name, {})
+            node[names[-1]] = (modes.get(path, '100644'), data)
+        self.root = self.add_tree(root)
+        self.commit = Commit('c' * 40, Tree(self.root, [], False))
+
+    def add_tree(self, node):
+        elements = []
+        for name in sorted(node):
+            if isinstance(node[name], dict):
+                sha = self.add_tree(node[name])
+                elements.append(Element(name, '040000', 'tree', sha, None))
+            else:
+                mode, data = node[name]
+                sha = blob_sha(data)
+                self.blobs[sha] = data
+                elements.append(Element(name, mode, 'blob', sha, len(data)))
+        sha = hashlib.sha1(repr(elements).encode('utf-8')).hexdigest()
+        self.trees[sha] = elements
+        return sha
+
+    def flatten(self, sha, prefix=''):
+        for element in self.trees[sha]:
+            path = prefix + element.path
+            yield element._replace(path=path)
+            if element.type == 'tree':
+                for child in self.flatten(element.sha, path + '/'):
+                    yield child
+
+    def get_branches(self):
+        self.calls.append(('get_branches',))
+        return [Branch('master', self.commit)]
+
+    def get_tags(self):
+        self.calls.append(('get_tags',))
+        return []
+
+    def get_git_commit(self, sha):
+        self.calls.append(('get_git_commit', sha))
+        return self.commit
+
+    def get_git_tree(self, sha, recursive=False):
+        self.calls.append(('get_git_tree', sha, recursive))
+        elements = list(self.flatten(sha)) if recursive else self.trees[sha]
+        truncated = len(elements) > self.max_entries
+        return Tree(sha, elements[:self.max_entries], truncated)
+
+    def get_git_blob(self, sha):
+        self.calls.append(('get_git_blob', sha))
+        data = self.blobs[sha]
+        return Blob(sha, len(data), base64.b64encode(data).decode('ascii'))
+
+    def get_contents(self, path, ref=None):
+        self.calls.append(('get_contents', path))
+        if path not in self.files:
+            raise GithubException(404, 'Not Found', None)
+        data = self.files[path]
+        return Content(path, 'file', blob_sha(data), len(data),
+                       base64.b64encode(data).decode('ascii'))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import io
+import stat
+import tarfile
+import zipfile
+
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import archive
+from tests.fakes import FakeRepository
+
+
+def make_repository():
+    return FakeRepository({'docs/b.txt': b'b', 'docs/a.txt': b'a', 'docs/sub/c.txt': b'c',
+                           'docs/link': b'sub/c.txt', 'README.rst': b'readme',
+                           'bin/run.sh': b'#!/bin/sh\n'},
+                          modes={'docs/link': '120000', 'bin/run.sh': '100755'})
+
+
+class TestArchive(TestCase):
+
+    def build(self, output_format):
+        stream = io.BytesIO()
+        archive(make_repository(), 'sha', 'docs', 'directory', stream, output_format)
+        return stream.getvalue()
+
+    def test_archive_tar_gz(self):
+        with tarfile.open(fileobj=io.BytesIO(self.build('tar.gz'))) as output:
+            self.assertEqual(output.getnames(), ['docs', 'docs/a.txt', 'docs/b.txt', 'docs/link',
+                                                 'docs/sub', 'docs/sub/c.txt'])
+            self.assertEqual(output.extractfile('docs/sub/c.txt').read(), b'c')
+            link = output.getmember('docs/link')
+            self.assertTrue(link.issym())
+            self.assertEqual(link.linkname, 'sub/c.txt')
+
+    def test_archive_zip(self):
+        with zipfile.ZipFile(io.BytesIO(self.build('zip'))) as output:
+            self.assertEqual(output.namelist(), ['docs/a.txt', 'docs/b.txt', 'docs/link',
+                                                 'docs/sub/c.txt'])
+            self.assertEqual(output.read('docs/a.txt'), b'a')
+            self.assertTrue(stat.S_ISLNK(output.getinfo('docs/link').external_attr >> 16))
+            self.assertEqual(output.read('docs/link'), b'sub/c.txt')
+
+    def test_archive_reproducible(self):
+        for output_format in ('tar', 'tar.gz', 'zip'):
+            self.assertEqual(self.build(output_format), self.build(output_format))
+
+    def test_archive_single_file(self):
+        repository = make_repository()
+        stream = io.BytesIO()
+        archive(repository, 'sha', 'bin/run.sh', 'file', stream, 'tar')
+        with tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as output:
+            self.assertEqual(output.getnames(), ['bin', 'bin/run.sh'])
+            self.assertEqual(output.getmember('bin/run.sh').mode, 0o755)
+            self.assertEqual(output.extractfile('bin/run.sh').read(), b'#!/bin/sh\n')
+        self.assertEqual([call[0] for call in repository.calls].count('get_git_blob'), 1)
+        self.assertNotIn('get_contents', [call[0] for call in repository.calls])
+
+    def test_archive_single_link(self):
+        stream = io.BytesIO()
+        archive(make_repository(), 'sha', 'docs/link', 'file', stream, 'zip')
+        with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as output:
+            self.assertEqual(output.namelist(), ['docs/link'])
+            self.assertTrue(stat.S_ISLNK(output.getinfo('docs/link').external_attr >> 16))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import shutil
+import tempfile
+import time
+
+import jwt
+
+from github import Auth
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from mock import patch
+from unittest import TestCase
+
+from pygithubctl.authenticator import InstallationTokenAuth
+from pygithubctl.authenticator import get_installation_token
+from pygithubctl.pygithubctl import get_github
+from pygithubctl.pygithubctl import get_options
+
+
+def make_private_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption())
+    return pem.decode('ascii'), key.public_key()
+
+
+def expires_in(seconds):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + seconds))
+
+
+class TestAuthenticator(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key, cls.public_key = make_private_key()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def get_token(self):
+        return get_installation_token('https://api.github.com', 42, self.private_key, 7,
+                                      cache_dir=self.cache_dir)
+
+    @patch('pygithubctl.authenticator.requests.post')
+    def test_installation_token_is_cached(self, post):
+        post.return_value.json.return_value = {'token': 'ghs_one', 'expires_at': expires_in(3600)}
+        self.assertEqual(self.get_token()[0], 'ghs_one')
+        self.assertEqual(self.get_token()[0], 'ghs_one')
+        self.assertEqual(post.call_count, 1)
+
+        url = post.call_args[0][0]
+        self.assertEqual(url, 'https://api.github.com/app/installations/7/access_tokens')
+        signed = post.call_args[1]['headers']['Authorization'].split(' ')[1]
+        claims = jwt.decode(signed, self.public_key, algorithms=['RS256'])
+        self.assertEqual(claims['iss'], '42')
+
+    @patch('pygithubctl.authenticator.requests.post')
+    def test_installation_token_expiring(self, post):
+        post.return_value.json.side_effect = [
+            {'token': 'ghs_one', 'expires_at': expires_in(60)},
+            {'token': 'ghs_two', 'expires_at': expires_in(3600)}]
+        self.assertEqual(self.get_token()[0], 'ghs_one')
+        self.assertEqual(self.get_token()[0], 'ghs_two')
+        self.assertEqual(post.call_count, 2)
+
+    @patch('pygithubctl.authenticator.requests.post')
+    def test_installation_token_auth(self, post):
+        post.return_value.json.return_value = {'token': 'ghs_one', 'expires_at': expires_in(3600)}
+        auth = InstallationTokenAuth('https://api.github.com', 42, self.private_key, 7,
+                                     cache_dir=self.cache_dir)
+        headers = {}
+        auth.authentication(headers)
+        auth.authentication(headers)
+        self.assertEqual(headers['Authorization'], 'token ghs_one')
+        self.assertEqual(post.call_count, 1)
+
+    def test_github_auth(self):
+        arguments = ['fetch', '--repository', 'repository', '--path', 'docs',
+                     '--type', 'dir', '--destination', '/tmp']
+        with patch('pygithubctl.pygithubctl.Github') as github:
+            get_github(get_options(arguments + ['--auth-token', 'someToken']))
+            auth = github.call_args[1]['auth']
+            self.assertIsInstance(auth, Auth.Token)
+            self.assertEqual(auth.token, 'someToken')
+
+            get_github(get_options(arguments + ['--username', 'user', '--password', 'secret']))
+            auth = github.call_args[1]['auth']
+            self.assertIsInstance(auth, Auth.Login)
+            self.assertEqual((auth.login, auth.password), ('user', 'secret'))
+            self.assertNotIn('login_or_token', github.call_args[1])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from pygithubctl.cache import TreeCache
+from pygithubctl.lister import list_tree
+from tests.fakes import FakeRepository
+
+COMMIT = 'c' * 40
+
+
+def make_files(count):
+    return dict(('src/module%d/file%d.txt' % (index % 7, index), b'%d' % index)
+                for index in range(count))
+
+
+class TestTreeCache(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_list_tree_cached(self):
+        cache = TreeCache(self.directory)
+        entries = list_tree(FakeRepository(make_files(50)), COMMIT, 'src', cache=cache)
+        repository = FakeRepository(make_files(50))
+        self.assertEqual(list_tree(repository, COMMIT, '/src/', cache=cache), entries)
+        self.assertEqual(repository.calls, [])
+
+    def test_list_tree_shared_subtree(self):
+        cache = TreeCache(self.directory)
+        list_tree(FakeRepository(make_files(50)), COMMIT, 'src/module3', cache=cache)
+        repository = FakeRepository(make_files(50))
+        other = 'd' * 40
+        entries = list_tree(repository, other, 'src/module3', cache=cache)
+        self.assertEqual(len(entries), 7)
+        self.assertTrue(all(entry.path.startswith('src/module3/') for entry in entries))
+        self.assertFalse([call for call in repository.calls if call[0] == 'get_git_tree'
+                          and call[2]])
+
+    def test_abbreviated_sha_not_cached(self):
+        cache = TreeCache(self.directory)
+        list_tree(FakeRepository(make_files(10)), 'sha', 'src', cache=cache)
+        repository = FakeRepository(make_files(10))
+        list_tree(repository, 'sha', 'src', cache=cache)
+        self.assertIn(('get_git_commit', 'sha'), repository.calls)
+
+    def test_evict(self):
+        cache = TreeCache(self.directory, max_bytes=1)
+        list_tree(FakeRepository(make_files(50)), COMMIT, 'src', cache=cache)
+        records = [name for _, _, names in os.walk(self.directory) for name in names]
+        self.assertEqual(records, [])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import Client
+from tests.fakes import FakeRepository
+
+
+class TestClient(TestCase):
+
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.repository = FakeRepository({'docs/a.txt': b'a', 'docs/sub/b.txt': b'b',
+                                          'README.rst': b'readme'})
+        with patch('pygithubctl.pygithubctl.Github') as github:
+            github.return_value.get_repo.return_value = self.repository
+            self.client = Client(auth_token='someToken', owner='sarathkumarsivan')
+        self.github = self.client.github
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def count(self, name):
+        return len([call for call in self.repository.calls if call[0] == name])
+
+    def test_fetch_directory_reuses_caches(self):
+        self.client.fetch_directory('pygithubctl', 'docs', self.destination)
+        self.client.fetch_directory('pygithubctl', 'docs', self.destination, incremental=True)
+        with open(os.path.join(self.destination, 'docs', 'sub', 'b.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'b')
+        self.assertEqual(self.github.get_repo.call_count, 1)
+        self.assertEqual(self.count('get_branches'), 1)
+        self.assertEqual(self.count('get_git_tree'), 2)
+        self.assertEqual(self.count('get_git_blob'), 2)
+
+    def test_resolve_ref(self):
+        self.assertEqual(self.client.resolve_ref('pygithubctl'), 'c' * 40)
+        self.assertEqual(self.client.resolve_ref('pygithubctl', 'a' * 40), 'a' * 40)
+        self.client.ref_ttl = 0
+        self.client.resolve_ref('pygithubctl')
+        self.assertEqual(self.count('get_branches'), 2)
+
+    def test_list_directory_eviction(self):
+        self.client.max_trees = 1
+        self.client.list_directory('pygithubctl', 'docs')
+        self.client.list_directory('pygithubctl', 'docs/sub')
+        self.client.list_directory('pygithubctl', 'docs')
+        self.assertEqual(len(self.client.trees), 1)
+        self.assertEqual(self.count('get_git_commit'), 3)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from unittest import TestCase
+
+from pygithubctl.cloner import clone_directory
+
+
+def git(*args):
+    return subprocess.check_output(('git',) + args).decode('utf-8').strip()
+
+
+class TestCloneDirectory(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.remote = os.path.join(cls.directory, 'remote')
+        os.makedirs(os.path.join(cls.remote, 'docs', 'sub'))
+        for path, data in (('docs/a.txt', 'a\n'), ('docs/sub/b.txt', 'b\n'), ('README.rst', 'r\n')):
+            with open(os.path.join(cls.remote, path), 'w') as stream:
+                stream.write(data)
+        os.symlink('sub', os.path.join(cls.remote, 'docs', 'link'))
+        git('-C', cls.remote, 'init', '-q')
+        git('-C', cls.remote, 'add', '.')
+        git('-C', cls.remote, '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+            'commit', '-q', '-m', 'Initial commit')
+        git('-C', cls.remote, 'config', 'uploadpack.allowFilter', 'true')
+        git('-C', cls.remote, 'config', 'uploadpack.allowAnySHA1InWant', 'true')
+        cls.sha = git('-C', cls.remote, 'rev-parse', 'HEAD')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def test_clone_directory(self):
+        with open(os.path.join(self.destination, 'keep.txt'), 'w') as stream:
+            stream.write('keep')
+        clone_directory('file://' + self.remote, self.sha, 'docs', self.destination)
+        with open(os.path.join(self.destination, 'docs', 'sub', 'b.txt')) as stream:
+            self.assertEqual(stream.read(), 'b\n')
+        self.assertEqual(sorted(os.listdir(self.destination)), ['docs', 'keep.txt'])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.destination, 'docs'))),
+                         ['a.txt', 'link', 'sub'])
+        self.assertEqual(os.readlink(os.path.join(self.destination, 'docs', 'link')), 'sub')
+
+    def test_clone_missing_directory(self):
+        for path in ('missing', 'README.rst'):
+            self.assertRaises(ValueError, clone_directory, 'file://' + self.remote, self.sha,
+                              path, self.destination)
+        self.assertEqual(os.listdir(self.destination), [])
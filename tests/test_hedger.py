@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+import time
+
+from unittest import TestCase
+
+from pygithubctl.hedger import Hedger
+from pygithubctl.hedger import LatencyTracker
+
+
+def warm_up(hedger, count=20):
+    for _ in range(count):
+        hedger.call(lambda: None)
+
+
+class TestLatencyTracker(TestCase):
+
+    def test_percentile(self):
+        tracker = LatencyTracker()
+        self.assertIsNone(tracker.percentile(95))
+        for latency in range(100):
+            tracker.record(latency)
+        self.assertEqual(tracker.percentile(50), 50)
+        self.assertEqual(tracker.percentile(95), 95)
+
+
+class TestHedger(TestCase):
+
+    def test_hedge_slow_request(self):
+        hedger = Hedger(95, max_share=1.0)
+        warm_up(hedger)
+        released = threading.Event()
+        calls = []
+
+        def request():
+            calls.append(1)
+            if len(calls) == 1:
+                released.wait(5)
+                return 'primary'
+            return 'hedge'
+
+        started = time.time()
+        self.assertEqual(hedger.call(request), 'hedge')
+        released.set()
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(hedger.hedges, 1)
+
+    def test_max_share(self):
+        hedger = Hedger(95, max_share=0.01)
+        warm_up(hedger)
+        self.assertEqual(hedger.call(lambda: time.sleep(0.05) or 'primary'), 'primary')
+        self.assertEqual(hedger.hedges, 0)
+
+    def test_all_requests_fail(self):
+        hedger = Hedger(95, max_share=1.0)
+        warm_up(hedger)
+
+        def request():
+            time.sleep(0.05)
+            raise IOError('Connection reset')
+
+        self.assertRaises(IOError, hedger.call, request)
+        self.assertEqual(hedger.hedges, 1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from unittest import TestCase
+
+from pygithubctl.lister import IncompleteListingException
+from pygithubctl.lister import list_tree
+from tests.fakes import FakeRepository
+
+
+def make_files(count):
+    return dict(('src/module%d/file%d.txt' % (index % 7, index), b'%d' % index)
+                for index in range(count))
+
+
+class TestListTree(TestCase):
+
+    def test_list_tree(self):
+        repository = FakeRepository(make_files(50))
+        entries = list_tree(repository, 'sha', 'src')
+        self.assertEqual(len(entries), 50)
+        self.assertEqual([entry.path for entry in entries],
+                         sorted(entry.path for entry in entries))
+        recursive = [call for call in repository.calls if call[0] == 'get_git_tree' and call[2]]
+        self.assertEqual(len(recursive), 1)
+
+    def test_list_tree_subdirectory(self):
+        repository = FakeRepository(make_files(50))
+        entries = list_tree(repository, 'sha', '/src/module3/')
+        self.assertEqual(len(entries), 7)
+        self.assertTrue(all(entry.path.startswith('src/module3/') for entry in entries))
+
+    def test_list_tree_truncated(self):
+        repository = FakeRepository(make_files(500), max_entries=100)
+        entries = list_tree(repository, 'sha', 'src', workers=4)
+        self.assertEqual(sorted(entry.path for entry in entries), sorted(make_files(500)))
+
+    def test_list_tree_incomplete(self):
+        files = dict(('src/file%d.txt' % index, b'%d' % index) for index in range(500))
+        repository = FakeRepository(files, max_entries=100)
+        self.assertRaises(IncompleteListingException, list_tree, repository, 'sha', 'src')
+
+    def test_list_tree_missing_directory(self):
+        repository = FakeRepository(make_files(10))
+        self.assertRaises(ValueError, list_tree, repository, 'sha', 'src/missing')
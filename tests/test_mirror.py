@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from mock import MagicMock
+from unittest import TestCase
+
+from pygithubctl.mirror import Mirror
+from pygithubctl.pygithubctl import download_directory
+from pygithubctl.pygithubctl import fetch
+from pygithubctl.pygithubctl import get_options
+from pygithubctl.pygithubctl import git_blob_sha
+
+
+def git(*args):
+    return subprocess.check_output(('git',) + args).decode('utf-8').strip()
+
+
+class TestMirror(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        work = os.path.join(cls.directory, 'work')
+        os.makedirs(os.path.join(work, 'docs', 'sub'))
+        for path, data in (('docs/a.txt', 'a\n'), ('docs/sub/b.txt', 'b\n'), ('README.rst', 'r\n')):
+            with open(os.path.join(work, path), 'w') as stream:
+                stream.write(data)
+        git('-C', work, 'init', '-q', '-b', 'master')
+        git('-C', work, 'add', '.')
+        git('-C', work, '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+            'commit', '-q', '-m', 'Initial commit')
+        git('-C', work, 'tag', 'v1.0')
+        cls.sha = git('-C', work, 'rev-parse', 'HEAD')
+        cls.path = os.path.join(cls.directory, 'mirror.git')
+        git('clone', '-q', '--mirror', work, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        self.fallback = MagicMock()
+        self.mirror = Mirror(self.path, lambda: self.fallback)
+        self.destination = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self.destination)
+
+    def test_resolve(self):
+        self.assertEqual(self.mirror.resolve('master'), self.sha)
+        self.assertEqual(self.mirror.resolve('v1.0'), self.sha)
+        self.assertEqual(self.mirror.resolve('missing'), None)
+
+    def test_download_directory(self):
+        download_directory(self.mirror, self.sha, 'docs', self.destination)
+        path = os.path.join(self.destination, 'docs', 'sub', 'b.txt')
+        with open(path) as stream:
+            self.assertEqual(stream.read(), 'b\n')
+        self.assertEqual(git_blob_sha(path), git('--git-dir', self.path, 'rev-parse',
+                                                 'master:docs/sub/b.txt'))
+        self.assertFalse(self.fallback.mock_calls)
+
+    def test_get_contents(self):
+        contents = self.mirror.get_contents('README.rst', ref=self.sha)
+        self.assertEqual(contents.size, 2)
+
+    def test_fallback(self):
+        self.fallback.get_git_blob.return_value = 'blob'
+        self.assertEqual(self.mirror.get_git_blob('0' * 40), 'blob')
+        self.fallback.get_git_blob.assert_called_once_with('0' * 40)
+        self.assertEqual(self.mirror.requests, 1)
+
+    def test_invalid_path(self):
+        self.assertRaises(ValueError, Mirror, self.destination, lambda: self.fallback)
+
+    def test_exited_process(self):
+        self.mirror.batch.kill()
+        self.mirror.batch.wait()
+        self.assertRaises(IOError, self.mirror.get_git_blob, '0' * 40)
+        self.assertFalse(self.fallback.mock_calls)
+
+    def test_mirror_with_git_backend(self):
+        options = get_options(['fetch', '--repository', 'pygithubctl', '--mirror', self.path,
+                               '--backend', 'git', '--branch', 'master', '--path', 'docs',
+                               '--type', 'dir', '--destination', self.destination])
+        self.assertRaises(ValueError, fetch, options)
+
+    def test_plan_json_through_main(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            (root, os.path.join(root, 'pygithubctl'))))
+        output = subprocess.check_output(
+            (sys.executable, '-c', 'from pygithubctl.pygithubctl import main; main()',
+             'fetch', '--repository', 'pygithubctl', '--mirror', self.path,
+             '--branch', 'master', '--path', 'docs', '--type', 'dir',
+             '--destination', self.destination, '--plan', 'json'), env=environment)
+        result = json.loads(output.decode('utf-8'))
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(result['engine'], 'mirror')
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import random
+import threading
+import time
+
+from collections import namedtuple
+from unittest import TestCase
+
+from pygithubctl.downloader import Pipeline
+from pygithubctl.pygithubctl import str_to_size
+
+Entry = namedtuple('Entry', ['path', 'size'])
+
+
+class TestPipeline(TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.peak = 0
+        self.written = []
+
+    def fetch(self, entry):
+        with self.lock:
+            self.inflight += entry.size
+            self.peak = max(self.peak, self.inflight)
+        time.sleep(random.uniform(0, 0.01))
+        return entry.path
+
+    def write(self, entry, data):
+        with self.lock:
+            self.inflight -= entry.size
+        self.written.append(data)
+
+    def test_pipeline_bounds_inflight_bytes(self):
+        entries = [Entry('file%d' % index, 100) for index in range(50)]
+        Pipeline(self.fetch, str.upper, self.write, workers=8, max_inflight_bytes=300).run(entries)
+        self.assertEqual(sorted(self.written), sorted(entry.path.upper() for entry in entries))
+        self.assertTrue(self.peak <= 300)
+
+    def test_pipeline_bounds_fetched_and_decoded_bytes(self):
+        def fetch(entry):
+            with self.lock:
+                self.inflight += entry.size * 4 // 3
+                self.peak = max(self.peak, self.inflight)
+            time.sleep(random.uniform(0, 0.01))
+            return entry
+
+        def decode(entry):
+            with self.lock:
+                self.inflight += entry.size
+                self.peak = max(self.peak, self.inflight)
+                self.inflight -= entry.size * 4 // 3
+            return entry.path
+
+        entries = [Entry('file%d' % index, 90) for index in range(50)]
+        Pipeline(fetch, decode, self.write, workers=8, max_inflight_bytes=700).run(entries)
+        self.assertEqual(len(self.written), 50)
+        self.assertTrue(self.peak <= 700)
+
+    def test_pipeline_oversized_entry(self):
+        entries = [Entry('small', 10), Entry('large', 1000), Entry('other', 10)]
+        Pipeline(self.fetch, str.upper, self.write, workers=4, max_inflight_bytes=100).run(entries)
+        self.assertEqual(len(self.written), 3)
+
+    def test_pipeline_ordered(self):
+        entries = [Entry('file%03d' % index, 10) for index in range(100)]
+        Pipeline(self.fetch, str.upper, self.write, workers=8, max_inflight_bytes=50,
+                 ordered=True).run(entries)
+        self.assertEqual(self.written, [entry.path.upper() for entry in entries])
+
+    def test_pipeline_error(self):
+        def fetch(entry):
+            if entry.path == 'file10':
+                raise IOError('Broken')
+            return entry.path
+
+        entries = [Entry('file%d' % index, 10) for index in range(1000)]
+        pipeline = Pipeline(fetch, str.upper, self.write, workers=4, max_inflight_bytes=50)
+        self.assertRaises(IOError, pipeline.run, entries)
+        self.assertTrue(len(self.written) < 1000)
+
+    def test_str_to_size(self):
+        self.assertEqual(str_to_size('512'), 512)
+        self.assertEqual(str_to_size('64K'), 64 * 1024)
+        self.assertEqual(str_to_size('1.5G'), 1536 * 1024 * 1024)
+        self.assertEqual(str_to_size('256MB'), 256 * 1024 * 1024)
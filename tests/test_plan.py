@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import shutil
+import tempfile
+
+from mock import MagicMock
+from mock import patch
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import get_options
+from pygithubctl.pygithubctl import plan
+from pygithubctl.pygithubctl import print_plan
+from tests.fakes import FakeRepository
+
+
+def make_options(type, path, *args):
+    return get_options(['fetch',
+                        '--auth-token', 'someToken',
+                        '--repository', 'pygithubctl',
+                        '--owner', 'sarathkumarsivan',
+                        '--path', path,
+                        '--type', type,
+                        '--destination', '/tmp'] + list(args))
+
+
+class TestPlan(TestCase):
+
+    def setUp(self):
+        self.repository = FakeRepository({'docs/a.txt': b'aaa', 'docs/sub/b.txt': b'bb',
+                                          'README.rst': b'readme'})
+        self.github = MagicMock()
+        self.github.rate_limiting = (1, 5000)
+
+    def test_plan_directory(self):
+        result = plan(self.repository, 'sha', make_options('dir', 'docs', '--plan'), 'api',
+                      self.github)
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(result['bytes'], 5)
+        self.assertEqual(result['requests'], {'planning': 3, 'download': 2})
+        self.assertFalse(result['rate_limit']['sufficient'])
+        self.assertFalse([call for call in self.repository.calls if call[0] == 'get_git_blob'])
+
+    def test_plan_directory_cached(self):
+        directory = tempfile.mkdtemp()
+        try:
+            options = make_options('dir', 'docs', '--tree-cache', '--cache-dir', directory)
+            plan(self.repository, 'c' * 40, options, 'api')
+            result = plan(self.repository, 'c' * 40, options, 'api')
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(result['requests'], {'planning': 0, 'download': 2})
+
+    def test_plan_file(self):
+        result = plan(self.repository, 'sha', make_options('file', 'docs/sub/b.txt'), 'api')
+        self.assertEqual(result['files'], 1)
+        self.assertEqual(result['bytes'], 2)
+        self.assertEqual(result['requests'], {'planning': 4, 'download': 1})
+        self.assertEqual(result['rate_limit'], None)
+
+    def test_plan_git_backend(self):
+        self.github.rate_limiting = (3, 5000)
+        result = plan(self.repository, 'sha', make_options('dir', 'docs'), 'git', self.github)
+        self.assertEqual(result['requests'], {'planning': 3, 'download': 0})
+        self.assertTrue(result['rate_limit']['sufficient'])
+        self.github.rate_limiting = (2, 5000)
+        result = plan(self.repository, 'sha', make_options('dir', 'docs'), 'git', self.github)
+        self.assertFalse(result['rate_limit']['sufficient'])
+
+    def test_plan_options(self):
+        self.assertEqual(make_options('dir', 'docs', '--plan').plan, 'text')
+        self.assertEqual(make_options('dir', 'docs', '--plan', 'json').plan, 'json')
+        self.assertEqual(make_options('dir', 'docs').plan, None)
+
+    @patch('pygithubctl.pygithubctl.sys.stdout')
+    def test_print_plan_json(self, stdout):
+        result = plan(self.repository, 'sha', make_options('dir', 'docs'), 'api', self.github)
+        print_plan(result, 'json')
+        self.assertEqual(json.loads(stdout.write.call_args[0][0]), result)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import base64
+import json
+import shutil
+import tempfile
+import threading
+import time
+
+from unittest import TestCase
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from requests import Session
+
+from pygithubctl.proxy import CacheProxy
+from pygithubctl.pygithubctl import get_github
+from pygithubctl.pygithubctl import get_options
+from pygithubctl.proxy import ProxyServer
+
+SHA = 'b' * 40
+
+BLOB = '/repos/owner/repository/git/blobs/' + SHA
+
+
+def get(url, token='someToken'):
+    session = Session()
+    if token:
+        session.headers['Authorization'] = 'token ' + token
+    return session.get(url)
+
+
+class GitHubHandler(BaseHTTPRequestHandler):
+    """
+    Answers the repository and blob requests of the GitHub API, slowly, so
+    concurrent requests for the same blob overlap.
+    """
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        url = 'http://127.0.0.1:%d' % self.server.server_port
+        if self.path == '/repos/owner/repository/git/refs/heads/master':
+            if self.headers.get('If-None-Match') == '"etag"':
+                self.send_response(304)
+                self.send_header('ETag', '"etag"')
+                self.end_headers()
+                return
+            document = {'ref': 'refs/heads/master', 'object': {'sha': SHA, 'type': 'commit'}}
+        elif self.headers.get('Authorization') != 'token someToken':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        elif self.path == '/repos/owner/repository':
+            document = {'url': url + '/repos/owner/repository', 'full_name': 'owner/repository',
+                        'name': 'repository'}
+        elif self.path == '/repos/owner/repository/git/blobs/' + SHA:
+            time.sleep(0.2)
+            document = {'url': url + '/repos/owner/repository/git/blobs/' + SHA, 'sha': SHA,
+                        'size': 5, 'encoding': 'base64',
+                        'content': base64.b64encode(b'hello').decode('ascii')}
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps(document).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+class TestCacheProxy(TestCase):
+
+    def setUp(self):
+        GitHubHandler.requests = []
+        self.directory = tempfile.mkdtemp()
+        self.upstream = serve(HTTPServer(('127.0.0.1', 0), GitHubHandler))
+        self.proxy = serve(ProxyServer(('127.0.0.1', 0), CacheProxy(
+            'http://127.0.0.1:%d' % self.upstream.server_port, self.directory)))
+        self.url = 'http://127.0.0.1:%d' % self.proxy.server_port
+
+    def tearDown(self):
+        for server in (self.proxy, self.upstream):
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_collapse_concurrent_requests(self):
+        responses = []
+
+        def request():
+            responses.append(get(self.url + BLOB))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([response.status_code for response in responses], [200] * 8)
+        self.assertEqual(set(response.json()['url'] for response in responses),
+                         set([self.url + BLOB]))
+        self.assertEqual(GitHubHandler.requests.count(BLOB), 1)
+
+    def test_deny_cached_objects_without_access(self):
+        self.assertEqual(get(self.url + BLOB).status_code, 200)
+        self.assertEqual(get(self.url + BLOB, token=None).status_code, 404)
+        self.assertEqual(get(self.url + BLOB, token='otherToken').status_code, 404)
+        self.assertEqual(get(self.url + BLOB).status_code, 200)
+        self.assertEqual(GitHubHandler.requests.count(BLOB), 1)
+
+    def test_pass_through_mutable_requests(self):
+        for _ in range(2):
+            self.assertEqual(get(self.url + '/repos/owner/missing').status_code, 404)
+        self.assertEqual(len(GitHubHandler.requests), 2)
+
+    def test_github_through_proxy(self):
+        github = get_github(get_options(['fetch',
+                                         '--auth-token', 'someToken',
+                                         '--repository', 'repository',
+                                         '--owner', 'owner',
+                                         '--path', 'docs',
+                                         '--type', 'dir',
+                                         '--destination', '/tmp',
+                                         '--proxy-url', self.url + '/']))
+        for _ in range(2):
+            repository = github.get_repo('owner/repository')
+            blob = repository.get_git_blob(SHA)
+            self.assertEqual(base64.b64decode(blob.content), b'hello')
+        self.assertEqual(GitHubHandler.requests, ['/repos/owner/repository',
+                                                  '/repos/owner/repository/git/blobs/' + SHA,
+                                                  '/repos/owner/repository'])
+
+    def test_relay_not_modified(self):
+        url = self.url + '/repos/owner/repository/git/refs/heads/master'
+        self.assertEqual(get(url).status_code, 200)
+        response = Session().get(url, headers={'If-None-Match': '"etag"',
+                                               'Authorization': 'token someToken'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], '"etag"')
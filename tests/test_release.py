@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+from mock import MagicMock
+from unittest import TestCase
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from requests import Session
+
+from pygithubctl.releaser import ChecksumException
+from pygithubctl.releaser import download_asset
+from pygithubctl.releaser import download_release
+from pygithubctl.releaser import split_ranges
+
+DATA = os.urandom(100000)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+
+    ranges = []
+    authorizations = []
+
+    def do_GET(self):
+        self.authorizations.append((self.path, self.headers.get('Authorization')))
+        if self.path.startswith('/api/'):
+            self.send_response(302)
+            self.send_header('Location', 'http://127.0.0.1:%d/%s'
+                             % (self.server.server_port, self.path[len('/api/'):]))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if self.path.endswith('/SHA256SUMS'):
+            body = ('%s *asset.bin\n' % hashlib.sha256(DATA).hexdigest()).encode('ascii')
+            self.send_response(200)
+        elif match:
+            start, end = int(match.group(1)), int(match.group(2))
+            self.ranges.append((start, end))
+            body = DATA[start:end + 1]
+            self.send_response(206)
+        else:
+            body = DATA
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_asset(name, url, size, digest=None):
+    asset = MagicMock()
+    asset.id = 1
+    asset.name = name
+    asset.url = url
+    asset.size = size
+    asset.digest = digest
+    return asset
+
+
+class TestRelease(TestCase):
+
+    def setUp(self):
+        RangeHandler.ranges = []
+        RangeHandler.authorizations = []
+        self.server = HTTPServer(('127.0.0.1', 0), RangeHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = 'http://127.0.0.1:%d' % self.server.server_port
+        self.assets = [make_asset('asset.bin', url + '/asset.bin', len(DATA)),
+                       make_asset('SHA256SUMS', url + '/SHA256SUMS', 100),
+                       make_asset('other.txt', url + '/other.txt', 10)]
+        self.repository = MagicMock()
+        self.repository.get_release.return_value.get_assets.return_value = self.assets
+        self.destination = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.destination)
+
+    def read(self, name):
+        with open(os.path.join(self.destination, name), 'rb') as stream:
+            return stream.read()
+
+    def test_split_ranges(self):
+        self.assertEqual(split_ranges(100, 4, 10), [[0, 24], [25, 49], [50, 74], [75, 99]])
+        self.assertEqual(split_ranges(100, 4, 60), [[0, 99]])
+        self.assertEqual(split_ranges(5, 4, 10), [[0, 4]])
+
+    def test_download_release_segments(self):
+        paths = download_release(self.repository, 'v1.0', ['*.bin'], self.destination,
+                                 Session(), segments=4, segment_size=1000, checksums='SHA256SUMS')
+        self.assertEqual(paths, [os.path.join(self.destination, 'asset.bin')])
+        self.assertEqual(self.read('asset.bin'), DATA)
+        self.assertEqual(len(RangeHandler.ranges), 4)
+        self.assertEqual(sorted(os.listdir(self.destination)), ['asset.bin'])
+
+    def test_download_release_resume(self):
+        part = os.path.join(self.destination, 'asset.bin.part')
+        with open(part, 'wb') as stream:
+            stream.write(DATA[:50000] + b'\0' * 50000)
+        with open(part + '.json', 'w') as stream:
+            json.dump({'id': 1, 'size': len(DATA),
+                       'segments': [[0, 49999, 50000], [50000, 99999, 0]]}, stream)
+        download_release(self.repository, 'v1.0', ['asset.bin'], self.destination, Session())
+        self.assertEqual(self.read('asset.bin'), DATA)
+        self.assertEqual(RangeHandler.ranges, [(50000, 99999)])
+
+    def test_download_release_checksum_mismatch(self):
+        self.assets[0].digest = 'sha256:' + '0' * 64
+        self.assertRaises(ChecksumException, download_release, self.repository, 'v1.0',
+                          ['asset.bin'], self.destination, Session())
+        self.assertEqual(os.listdir(self.destination), [])
+
+    def test_download_release_no_match(self):
+        self.assertRaises(ValueError, download_release, self.repository, 'v1.0',
+                          ['*.zip'], self.destination, Session())
+
+    def test_download_release_storage_without_credentials(self):
+        api = 'http://localhost:%d/api' % self.server.server_port
+        for asset in self.assets:
+            asset.url = api + '/' + asset.name
+        session = Session()
+        session.auth = ('user', 'password')
+        download_release(self.repository, 'v1.0', ['*.bin'], self.destination, session,
+                         segments=2, segment_size=1000, checksums='SHA256SUMS')
+        self.assertEqual(self.read('asset.bin'), DATA)
+        api_requests = [auth for path, auth in RangeHandler.authorizations if path.startswith('/api/')]
+        storage_requests = [auth for path, auth in RangeHandler.authorizations if not path.startswith('/api/')]
+        self.assertEqual(len(api_requests), 2)
+        self.assertTrue(all(auth and auth.startswith('Basic ') for auth in api_requests))
+        self.assertEqual(storage_requests, [None, None, None])
+
+    def test_download_empty_asset(self):
+        asset = make_asset('empty.txt', 'http://127.0.0.1:1/empty.txt', 0)
+        session = MagicMock()
+        path = download_asset(session, asset, self.destination,
+                              checksum='sha256:' + hashlib.sha256(b'').hexdigest())
+        self.assertEqual(self.read('empty.txt'), b'')
+        self.assertEqual(path, os.path.join(self.destination, 'empty.txt'))
+        self.assertEqual(sorted(os.listdir(self.destination)), ['empty.txt'])
+        self.assertFalse(session.get.called)
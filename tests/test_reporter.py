@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import io
+import logging
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from pygithubctl.configurer import configure_logging_file
+from pygithubctl.configurer import configure_logging_queue
+from pygithubctl.configurer import stop_logging_queue
+from pygithubctl.reporter import ProgressReporter
+
+
+class TestLogging(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_configure_logging_file(self):
+        path = os.path.join(self.directory, 'pygithubctl.log')
+        logger = configure_logging_file(logging.getLogger('test_file'), '%(levelname)s %(message)s', path)
+        logger.warning('Hello %s', 'file')
+        for handler in logger.handlers:
+            handler.close()
+        with open(path) as stream:
+            self.assertEqual(stream.read(), 'WARNING Hello file\n')
+
+    def test_configure_logging_queue(self):
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        logger = logging.getLogger('test_queue')
+        logger.addHandler(handler)
+        configure_logging_queue(logger)
+        self.assertNotIn(handler, logger.handlers)
+        logger.warning('Hello %s', 'queue')
+        stop_logging_queue(logger)
+        self.assertEqual(stream.getvalue(), 'WARNING Hello queue\n')
+
+
+class TestProgressReporter(TestCase):
+
+    def test_summary(self):
+        reporter = ProgressReporter(4, 4 * 1024 * 1024, rate_limit=lambda: 4999)
+        reporter.skip(1024 * 1024)
+        reporter.update(1024 * 1024)
+        summary = reporter.summary()
+        self.assertTrue(summary.startswith('Downloaded 1/3 files, 1.0 MB/3.0 MB ('))
+        self.assertTrue(summary.endswith('rate limit remaining 4999)'))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import download_directory
+from pygithubctl.pygithubctl import get_options
+from pygithubctl.pygithubctl import verify
+from pygithubctl.verifier import list_files
+from tests.fakes import FakeRepository
+
+FILES = {'docs/a.txt': b'aaa', 'docs/sub/b.txt': b'bb', 'docs/sub/c.txt': b'c',
+         'README.rst': b'readme'}
+
+
+class TestVerify(TestCase):
+
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.repository = FakeRepository(FILES)
+        download_directory(self.repository, 'c' * 40, 'docs', self.destination)
+        self.options = get_options(['verify',
+                                    '--auth-token', 'someToken',
+                                    '--repository', 'pygithubctl',
+                                    '--owner', 'sarathkumarsivan',
+                                    '--branch', 'master',
+                                    '--path', 'docs',
+                                    '--destination', self.destination,
+                                    '--processes', '2'])
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def test_list_files(self):
+        self.assertEqual(sorted(list_files(self.destination, '/docs/')),
+                         ['docs/a.txt', 'docs/sub/b.txt', 'docs/sub/c.txt'])
+
+    @patch('pygithubctl.pygithubctl.get_github')
+    @patch('pygithubctl.pygithubctl.get_repository')
+    def test_verify_matching(self, get_repository, get_github):
+        get_repository.return_value = self.repository
+        del self.repository.calls[:]
+        result = verify(self.options)
+        self.assertEqual(result, {'missing': [], 'extra': [], 'modified': []})
+        self.assertFalse([call for call in self.repository.calls if call[0] == 'get_git_blob'])
+
+    @patch('pygithubctl.pygithubctl.get_github')
+    @patch('pygithubctl.pygithubctl.get_repository')
+    def test_verify_differences(self, get_repository, get_github):
+        get_repository.return_value = self.repository
+        os.remove(os.path.join(self.destination, 'docs', 'a.txt'))
+        with open(os.path.join(self.destination, 'docs', 'sub', 'b.txt'), 'wb') as stream:
+            stream.write(b'changed')
+        with open(os.path.join(self.destination, 'docs', 'sub', 'd.txt'), 'wb') as stream:
+            stream.write(b'd')
+        result = verify(self.options)
+        self.assertEqual(result, {'missing': ['docs/a.txt'], 'extra': ['docs/sub/d.txt'],
+                                  'modified': ['docs/sub/b.txt']})
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import tempfile
+
+from github import GithubException
+from mock import MagicMock
+from mock import patch
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import download_directory
+from pygithubctl.pygithubctl import get_options
+from pygithubctl.pygithubctl import git_blob_sha
+from pygithubctl.pygithubctl import watch
+from tests.fakes import FakeRepository
+
+
+class TestWatch(TestCase):
+
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.options = get_options(['watch',
+                                    '--auth-token', 'someToken',
+                                    '--repository', 'pygithubctl',
+                                    '--owner', 'sarathkumarsivan',
+                                    '--branch', 'master',
+                                    '--path', 'docs',
+                                    '--type', 'dir',
+                                    '--destination', self.destination,
+                                    '--interval', '5',
+                                    '--jitter', '2'])
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def test_watch_options(self):
+        self.assertEqual(self.options.command, 'watch')
+        self.assertEqual(self.options.interval, 5)
+        self.assertEqual(self.options.jitter, 2)
+
+    def test_git_blob_sha(self):
+        path = os.path.join(self.destination, 'hello')
+        with open(path, 'wb') as stream:
+            stream.write(b'hello\n')
+        self.assertEqual(git_blob_sha(path), 'ce013625030ba8dba906f756967f9e9ca394464a')
+
+    @patch('pygithubctl.pygithubctl.time.sleep')
+    @patch('pygithubctl.pygithubctl.download')
+    @patch('pygithubctl.pygithubctl.get_sha')
+    @patch('pygithubctl.pygithubctl.get_github')
+    def test_watch_syncs_only_on_change(self, get_github, get_sha, download, sleep):
+        reference = MagicMock()
+        reference.update.side_effect = [False, True, False]
+        repository = get_github.return_value.get_repo.return_value
+        repository.get_git_ref.return_value = reference
+        get_sha.side_effect = ['sha1', 'sha2']
+
+        watch(self.options, polls=4)
+
+        self.assertEqual(get_sha.call_count, 2)
+        self.assertEqual([call[0][1] for call in download.call_args_list], ['sha1', 'sha2'])
+        self.assertEqual(sleep.call_count, 3)
+        for call in sleep.call_args_list:
+            self.assertTrue(5 <= call[0][0] <= 7)
+
+    @patch('pygithubctl.pygithubctl.time.sleep')
+    @patch('pygithubctl.pygithubctl.download')
+    @patch('pygithubctl.pygithubctl.get_sha')
+    @patch('pygithubctl.pygithubctl.get_github')
+    def test_watch_retries_failed_sync(self, get_github, get_sha, download, sleep):
+        reference = MagicMock()
+        reference.update.side_effect = [True, False, False]
+        repository = get_github.return_value.get_repo.return_value
+        repository.get_git_ref.return_value = reference
+        get_sha.side_effect = ['sha1', 'sha2', 'sha2']
+        download.side_effect = [None, GithubException(500, 'Server Error', None), None]
+
+        watch(self.options, polls=4)
+
+        self.assertEqual([call[0][1] for call in download.call_args_list],
+                         ['sha1', 'sha2', 'sha2'])
+        self.assertEqual(reference.update.call_count, 2)
+
+    def test_download_directory_prune(self):
+        repository = FakeRepository({'docs/a.txt': b'a', 'docs/sub/b.txt': b'b'})
+        download_directory(repository, 'sha', 'docs', self.destination)
+        repository = FakeRepository({'docs/a.txt': b'a'})
+        os.makedirs(os.path.join(self.destination, 'other'))
+        with open(os.path.join(self.destination, 'other', 'keep.txt'), 'w') as stream:
+            stream.write('keep')
+        download_directory(repository, 'sha', 'docs', self.destination, incremental=True,
+                           prune=True)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.destination, 'docs'))), ['a.txt'])
+        self.assertTrue(os.path.isfile(os.path.join(self.destination, 'other', 'keep.txt')))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019 Sarath Kumar Sivan, https://github.com/sarathkumarsivan
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NON-INFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import shutil
+import stat
+import tempfile
+
+from unittest import TestCase
+
+from pygithubctl.pygithubctl import download_directory
+from pygithubctl.pygithubctl import is_up_to_date
+from tests.fakes import FakeRepository
+from tests.fakes import blob_sha
+
+
+class TestWriter(TestCase):
+
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.repository = FakeRepository(
+            {'bin/run.sh': b'#!/bin/sh\n', 'bin/link': b'run.sh', 'docs/a/b/c.txt': b'c'},
+            modes={'bin/run.sh': '100755', 'bin/link': '120000'})
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def path(self, *names):
+        return os.path.join(self.destination, *names)
+
+    def test_download_directory_modes(self):
+        download_directory(self.repository, 'sha', '', self.destination, fsync=True)
+        self.assertTrue(os.stat(self.path('bin', 'run.sh')).st_mode & stat.S_IXUSR)
+        self.assertFalse(os.stat(self.path('docs', 'a', 'b', 'c.txt')).st_mode & stat.S_IXUSR)
+        self.assertEqual(os.readlink(self.path('bin', 'link')), 'run.sh')
+        self.assertTrue(is_up_to_date(self.path('bin', 'link'), blob_sha(b'run.sh')))
+        self.assertEqual(sorted(os.listdir(self.path('bin'))), ['link', 'run.sh'])
+
+    def test_download_directory_replaces_files(self):
+        os.makedirs(self.path('docs', 'a', 'b'))
+        with open(self.path('docs', 'a', 'b', 'c.txt'), 'w') as stream:
+            stream.write('old content')
+        download_directory(self.repository, 'sha', 'docs', self.destination)
+        with open(self.path('docs', 'a', 'b', 'c.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'c')
+        self.assertEqual(os.listdir(self.path('docs', 'a', 'b')), ['c.txt'])
+
+    def test_download_directory_relative_destination(self):
+        current = os.getcwd()
+        os.chdir(self.destination)
+        try:
+            download_directory(self.repository, 'sha', 'docs', 'out/')
+        finally:
+            os.chdir(current)
+        with open(self.path('out', 'docs', 'a', 'b', 'c.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'c')
+
+    def test_download_directory_nested_destination(self):
+        destination = self.path('x', 'y')
+        download_directory(self.repository, 'sha', 'docs', destination)
+        with open(os.path.join(destination, 'docs', 'a', 'b', 'c.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'c')